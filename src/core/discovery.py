@@ -5,34 +5,51 @@
 
 import os
 import json
+import functools
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
 from src.utils.logger import Logger
 from src.core.metadata import ServiceMetadataManager
 
+@dataclass
+class ServiceTable:
+    """服务信息表
+    
+    除完整的服务定义外，按列保存常用字段，便于只关心单个字段的调用方直接查询。
+    """
+    
+    definitions: Dict[str, dict] = field(default_factory=dict)  # 服务名称 -> 完整服务定义
+    paths: Dict[str, str] = field(default_factory=dict)  # 服务名称 -> 服务目录
+    versions: Dict[str, str] = field(default_factory=dict)  # 服务名称 -> 服务版本
+    repo_paths: Dict[str, str] = field(default_factory=dict)  # 服务名称 -> 代码仓库路径（仅在定义中配置时存在）
+    
+    def add(self, service_name: str, service_info: dict) -> None:
+        """添加或更新服务信息"""
+        self.definitions[service_name] = service_info
+        self.paths[service_name] = service_info['path']
+        self.versions[service_name] = service_info.get('version')
+        if 'repo_path' in service_info:
+            self.repo_paths[service_name] = service_info['repo_path']
+        else:
+            self.repo_paths.pop(service_name, None)
+    
+    def __contains__(self, service_name: str) -> bool:
+        return service_name in self.definitions
+
+
 class ServiceDiscovery:
     """服务发现器
     
     负责扫描目录，发现服务并管理其状态。
-    使用单例模式确保全局只有一个实例。
+    通过get_discovery()获取全局共享的实例。
     """
     
-    _instance = None
-    
-    def __new__(cls, repo_path: Path = None):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self, repo_path: Path = None):
-        if self._initialized:
-            return
-            
+    def __init__(self):
         self.services_path = Path(__file__).parent.parent / 'services' / 'implementations'
-        self.services: Dict[str, Dict] = {}  # 服务信息字典
+        self.services = ServiceTable()  # 服务信息表
+        self.metadata_manager = ServiceMetadataManager(self.services_path)
         self.logger = Logger(__name__)
-        self._initialized = True
     
     def scan_services(self) -> List[Dict]:
         """扫描服务目录并返回服务基本信息列表
@@ -43,22 +60,21 @@ class ServiceDiscovery:
         try:
             self.logger.info(f'开始扫描服务目录: {self.services_path}')
             services_info = []
-            # 扫描services目录下的所有子目录
-            for item in os.scandir(self.services_path):
-                if item.is_dir():
-                    service_path = Path(item.path)
-                    service_name = item.name
-                    
-                    # 获取服务定义信息
-                    service_info = self.parse_service(service_path)
-                    if service_info:
-                        service_info['name'] = service_name
-                        service_info['path'] = str(service_path)
-                        self.services[service_name] = service_info
-                        services_info.append(service_info)
-                        self.logger.info(f'成功加载服务: {service_name}, 版本: {service_info.get("version", "未知")}')
-                    else:
-                        self.logger.warning(f'目录 {service_name} 不包含有效的服务定义')
+            # 扫描services目录下的所有子目录，先用DirEntry过滤掉非目录项
+            with os.scandir(self.services_path) as it:
+                service_dirs = [(item.name, item.path) for item in it if item.is_dir(follow_symlinks=False)]
+            
+            for service_name, service_dir in service_dirs:
+                # 获取服务定义信息
+                service_info = self.parse_service(Path(service_dir))
+                if service_info:
+                    service_info['name'] = service_name
+                    service_info['path'] = service_dir
+                    self.services.add(service_name, service_info)
+                    services_info.append(service_info)
+                    self.logger.info(f'成功加载服务: {service_name}, 版本: {service_info.get("version", "未知")}')
+                else:
+                    self.logger.warning(f'目录 {service_name} 不包含有效的服务定义')
             
             self.logger.info(f'服务扫描完成，共发现 {len(services_info)} 个有效服务')
             return services_info
@@ -66,14 +82,40 @@ class ServiceDiscovery:
             self.logger.error(f'扫描服务失败: {str(e)}')
             return []
     
+    def fingerprint(self) -> int:
+        """计算服务目录的指纹
+        
+        只遍历一次服务目录，并读取每个服务service.json的修改时间，不解析文件内容。
+        服务目录增删或service.json被修改时指纹随之变化，可用于判断是否需要重新扫描。
+        
+        Returns:
+            int: 服务目录指纹，服务目录不存在时返回0
+        """
+        entries = []
+        try:
+            with os.scandir(self.services_path) as it:
+                for item in it:
+                    if not item.is_dir(follow_symlinks=False):
+                        continue
+                    try:
+                        mtime_ns = os.stat(os.path.join(item.path, 'service.json')).st_mtime_ns
+                    except OSError:
+                        mtime_ns = 0
+                    entries.append((item.name, mtime_ns))
+        except OSError:
+            return 0
+        return hash(frozenset(entries))
+    
     def parse_service(self, service_path: Path) -> Optional[dict]:
         """解析服务定义"""
-        metadata_manager = ServiceMetadataManager(service_path)
-        return metadata_manager.parse_service_metadata(service_path)
+        return self.metadata_manager.parse_service_metadata(service_path)
     
     def get_service_info(self, service_name: str) -> Optional[dict]:
         """获取服务信息"""
-        if service_name not in self.services:
-            return None
-        
-        return self.services[service_name]
\ No newline at end of file
+        return self.services.definitions.get(service_name)
+
+
+@functools.lru_cache(maxsize=None)
+def get_discovery() -> ServiceDiscovery:
+    """获取全局共享的服务发现器实例"""
+    return ServiceDiscovery()
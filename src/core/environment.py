@@ -4,48 +4,152 @@
 """
 
 import os
+import re
+import functools
 import subprocess
+import sysconfig
+import time
+import traceback
 import venv
-import tomli
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Set
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.utils import canonicalize_name
+from packaging.version import Version, InvalidVersion
 from src.utils.logger import Logger
-from src.core.discovery import ServiceDiscovery
+from src.core.discovery import get_discovery
+
+# 项目根目录
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# pip更新标记文件及有效期（秒），有效期内不再重复更新pip
+_PIP_MARKER = '.pip_upgraded'
+_PIP_UPGRADE_INTERVAL = 86400
+
+# METADATA文件头部中的包名和版本字段
+_METADATA_HEADER_RE = re.compile(r'^(Name|Version):\s*(.+)$', re.M)
+
+
+@functools.lru_cache(maxsize=None)
+def _venv_bins(env_path: Path) -> tuple:
+    """获取虚拟环境中的pip和python解释器路径
+    
+    Returns:
+        tuple: (pip_path, python_path)
+    """
+    bin_dir = env_path / ('Scripts' if os.name == 'nt' else 'bin')
+    return bin_dir / 'pip', bin_dir / 'python'
+
+
+def _pip_upgrade_due(env_path: Path) -> bool:
+    """判断虚拟环境中的pip是否需要更新"""
+    try:
+        return time.time() - (env_path / _PIP_MARKER).stat().st_mtime >= _PIP_UPGRADE_INTERVAL
+    except FileNotFoundError:
+        return True
+
+
+def _touch_pip_marker(env_path: Path) -> None:
+    """刷新pip更新标记"""
+    (env_path / _PIP_MARKER).touch()
+
+
+@functools.lru_cache(maxsize=None)
+def _site_packages(env_path: Path) -> Path:
+    """获取虚拟环境的site-packages路径
+    
+    虚拟环境由当前解释器创建，使用venv安装方案（Python 3.11+）计算路径；
+    不能使用默认方案，部分发行版的默认方案（如Debian的posix_local）不是venv布局。
+    """
+    if 'venv' in sysconfig.get_scheme_names():
+        scheme = 'venv'
+    else:
+        scheme = 'nt' if os.name == 'nt' else 'posix_prefix'
+    paths = sysconfig.get_paths(scheme, vars={'base': str(env_path), 'platbase': str(env_path)})
+    return Path(paths['purelib'])
+
+
+def _list_dir(path: Path) -> Set[str]:
+    """列出目录下的条目名称，目录不存在时返回空集合"""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return set()
+
+
+def _enumerate_installed(env_path: Path) -> dict:
+    """直接读取dist-info元数据，枚举虚拟环境中已安装的包
+    
+    Args:
+        env_path: 虚拟环境路径
+    
+    Returns:
+        dict: 规范化包名到版本(packaging.version.Version)的映射
+    """
+    installed = {}
+    try:
+        with os.scandir(_site_packages(env_path)) as it:
+            metadata_paths = [
+                os.path.join(entry.path, 'METADATA')
+                for entry in it
+                if entry.name.endswith('.dist-info') and entry.is_dir(follow_symlinks=False)
+            ]
+    except FileNotFoundError:
+        return installed
+    
+    for metadata_path in metadata_paths:
+        try:
+            # 元数据头部以第一个空行结束，之后是包的长描述
+            header_lines = []
+            with open(metadata_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    if not line.strip():
+                        break
+                    header_lines.append(line)
+            headers = dict(_METADATA_HEADER_RE.findall(''.join(header_lines)))
+            if 'Name' in headers and 'Version' in headers:
+                installed[canonicalize_name(headers['Name'].strip())] = Version(headers['Version'].strip())
+        except (OSError, InvalidVersion):
+            continue
+    return installed
+
 
 class EnvironmentManager:
     """环境管理器
     
     负责服务运行环境的创建、配置和管理。
-    使用单例模式确保全局只有一个实例。
+    通过get_environment_manager()获取按项目根目录共享的实例。
     """
     
-    _instance = None
-    
-    def __new__(cls, base_path: Path = None):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
-    def __init__(self, base_path: Path = None):
-        if self._initialized:
-            return
-        self.base_path = base_path
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path).resolve()
         self.environments: Dict[str, Path] = {}
-        self.discovery = ServiceDiscovery(base_path)
+        # 服务仓库路径缓存: 服务名称 -> (配置的repo_path, 仓库路径)，配置变化时失效
+        self._repo_path_cache: Dict[str, tuple] = {}
+        self.discovery = get_discovery()
         self.logger = Logger(__name__)
-        self._initialized = True
+        # 批量环境检查使用的线程池，在多次调用之间复用，线程按需创建
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='EnvironmentCheck')
     
     def _get_service_repo_path(self, service_name: str) -> Optional[Path]:
         """获取服务代码仓库路径"""
         try:
-            service_info = self.discovery.get_service_info(service_name)
-            if not service_info or 'repo_path' not in service_info:
+            configured = self.discovery.services.repo_paths.get(service_name)
+            # 配置的repo_path未变时直接复用缓存的路径
+            cached = self._repo_path_cache.get(service_name)
+            if cached and cached[0] == configured:
+                return cached[1]
+            
+            if configured is None:
                 # 如果没有配置repo_path，则使用默认路径
-                return self.base_path.resolve() / 'repo' / service_name
-            # 确保返回的是绝对路径
-            repo_path = Path(service_info['repo_path'])
-            return self.base_path.resolve() / "repo" / repo_path
+                repo_path = self.base_path / 'repo' / service_name
+            else:
+                # base_path在初始化时已解析为绝对路径
+                repo_path = self.base_path / "repo" / Path(configured)
+            self._repo_path_cache[service_name] = (configured, repo_path)
+            return repo_path
         except Exception as e:
             self.logger.error(f'获取服务仓库路径失败: {str(e)}')
             return None
@@ -108,13 +212,8 @@ class EnvironmentManager:
                 if config_path.exists():
                     self.logger.info(f'找到依赖配置文件: {config_file}')
                     if install_func():
-                        # 验证依赖是否真正安装成功
-                        if self._verify_dependencies(env_path, config_path):
-                            self.logger.info(f'服务 {service_name} 的依赖安装并验证成功')
-                            return True
-                        else:
-                            self.logger.error(f'服务 {service_name} 的依赖验证失败')
-                            return False
+                        self.logger.info(f'服务 {service_name} 的依赖安装成功')
+                        return True
                     else:
                         self.logger.error(f'从{config_file}安装依赖失败')
                         return False
@@ -124,48 +223,6 @@ class EnvironmentManager:
             
         except Exception as e:
             self.logger.error(f'安装依赖失败: {str(e)}')
-            import traceback
-            self.logger.error(f'错误堆栈:\n{traceback.format_exc()}')
-            return False
-
-    def _verify_dependencies(self, env_path: Path, config_path: Path) -> bool:
-        """验证依赖是否真正安装成功
-        
-        Args:
-            env_path: 虚拟环境路径
-            config_path: 依赖配置文件路径
-            
-        Returns:
-            bool: 依赖验证是否通过
-        """
-        try:
-            # 获取虚拟环境中的pip路径
-            if os.name == 'nt':
-                pip_path = env_path / 'Scripts' / 'pip'
-            else:
-                pip_path = env_path / 'bin' / 'pip'
-            
-            # 获取已安装的包列表
-            result = subprocess.run(
-                [str(pip_path), 'list', '--format=json'],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode != 0:
-                self.logger.error(f'获取已安装包列表失败: {result.stderr}')
-                return False
-            
-            # 解析已安装的包
-            import json
-            installed_packages = json.loads(result.stdout)
-            self.logger.info(f'当前已安装的包: {[pkg["name"] for pkg in installed_packages]}')
-            
-            return True
-            
-        except Exception as e:
-            self.logger.error(f'验证依赖失败: {str(e)}')
-            import traceback
             self.logger.error(f'错误堆栈:\n{traceback.format_exc()}')
             return False
 
@@ -203,21 +260,23 @@ class EnvironmentManager:
             'config_type': None
         }
         
-        # 检查虚拟环境
-        env_path = self.get_environment(service_name)
-        if not env_path:
-            self.logger.warning(f'服务 {service_name} 的虚拟环境不存在')
-            return status
-            
-        self.logger.info(f'找到服务 {service_name} 的虚拟环境: {env_path}')
-        status['venv_exists'] = True
-        
         # 获取服务仓库路径
         repo_path = self._get_service_repo_path(service_name)
         if not repo_path:
             self.logger.error(f'无法获取服务 {service_name} 的仓库路径')
             return status
         
+        # 遍历一次仓库目录，同时得到虚拟环境和依赖配置文件是否存在
+        entries = _list_dir(repo_path)
+        
+        # 检查虚拟环境
+        if '.venv' not in entries:
+            self.logger.warning(f'服务 {service_name} 的虚拟环境不存在')
+            return status
+        
+        env_path = repo_path / '.venv'
+        self.logger.info(f'找到服务 {service_name} 的虚拟环境: {env_path}')
+        status['venv_exists'] = True
         self.logger.info(f'找到服务仓库路径: {repo_path}')
         
         # 检查各种配置文件
@@ -229,7 +288,7 @@ class EnvironmentManager:
         
         for config_file, check_func in config_files.items():
             config_path = repo_path / config_file
-            if config_path.exists():
+            if config_file in entries:
                 self.logger.info(f'找到依赖配置文件: {config_file}')
                 status['config_type'] = config_file
                 status['dependencies_installed'] = check_func(env_path, config_path)
@@ -252,46 +311,133 @@ class EnvironmentManager:
         
         return status
 
-    def _install_from_requirements(self, env_path: Path, requirements_path: Path) -> bool:
-        """从requirements.txt安装依赖"""
-        try:
-            self.logger.info(f'开始从 {requirements_path} 安装依赖')
-            # 获取虚拟环境中的pip路径
-            if os.name == 'nt':
-                pip_path = env_path / 'Scripts' / 'pip'
+    def check_environments_bulk(self, service_names: List[str]) -> Dict[str, dict]:
+        """并发检查多个服务的环境状态
+        
+        各服务的环境检查互不依赖且以文件IO为主，使用线程池并发执行。
+        服务信息在scan_services时写入，这里只做读取；仓库路径缓存只有单键赋值，
+        依赖解析缓存由lru_cache加锁，logging本身也是线程安全的。
+        
+        Args:
+            service_names: 服务名称列表
+        
+        Returns:
+            Dict[str, dict]: 服务名称到环境状态信息的映射，状态格式同check_environment
+        """
+        if not service_names:
+            return {}
+        
+        return dict(zip(service_names, self._executor.map(self.check_environment, service_names)))
+
+    def _run_streaming(self, cmd: List[str], cwd: Optional[Path] = None) -> int:
+        """运行安装命令并逐行输出日志
+        
+        stdout和stderr合并后逐行写入日志，不在内存中缓存全部输出。
+        
+        Args:
+            cmd: 要执行的命令
+            cwd: 工作目录
+        
+        Returns:
+            int: 进程返回码
+        """
+        with subprocess.Popen(
+            cmd,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        ) as proc:
+            for line in proc.stdout:
+                self.logger.info(line.rstrip())
+            return proc.wait()
+
+    def install_dependencies_bulk(self, service_names: List[str]) -> Dict[str, bool]:
+        """批量安装多个服务的依赖
+        
+        共用同一虚拟环境的服务合并为一次pip调用（每个requirements.txt对应一个-r参数），
+        不同虚拟环境之间并发安装。没有requirements.txt的服务回退到install_dependencies。
+        
+        Args:
+            service_names: 服务名称列表
+        
+        Returns:
+            Dict[str, bool]: 服务名称到依赖安装是否成功的映射
+        """
+        results: Dict[str, bool] = {}
+        groups: Dict[Path, List[tuple]] = {}
+        fallback: List[str] = []
+        
+        # 按虚拟环境分组
+        for service_name in service_names:
+            env_path = self.get_environment(service_name)
+            repo_path = self._get_service_repo_path(service_name)
+            if not env_path or not repo_path:
+                self.logger.error(f'服务 {service_name} 的环境路径或仓库路径不存在')
+                results[service_name] = False
+                continue
+            requirements_path = repo_path / 'requirements.txt'
+            if requirements_path.exists():
+                groups.setdefault(env_path, []).append((service_name, requirements_path))
             else:
-                pip_path = env_path / 'bin' / 'pip'
-            self.logger.info(f'使用pip路径: {pip_path}')
+                fallback.append(service_name)
+        
+        if not groups and not fallback:
+            return results
+        
+        def install_group(env_path: Path, members: List[tuple]) -> Dict[str, bool]:
+            # 多个服务共用同一份requirements.txt时只传一次
+            requirements_paths = list(dict.fromkeys(path for _, path in members))
+            success = self._install_from_requirements(env_path, *requirements_paths)
+            return {service_name: success for service_name, _ in members}
+        
+        # pip运行在子进程中，不受GIL限制，不同虚拟环境可以并发安装
+        with ThreadPoolExecutor(max_workers=min(8, len(groups) + len(fallback))) as executor:
+            futures = [executor.submit(install_group, env_path, members) for env_path, members in groups.items()]
+            futures += [executor.submit(lambda name: {name: self.install_dependencies(name)}, name) for name in fallback]
+            for future in futures:
+                results.update(future.result())
+        
+        return results
+
+    def _upgrade_pip(self, env_path: Path, python_path: Path) -> None:
+        """更新虚拟环境中的pip，距上次更新不足一天时跳过
+        
+        单独调用pip，避免--upgrade作用到依赖包上；更新失败只记录警告，不影响依赖安装。
+        """
+        if not _pip_upgrade_due(env_path):
+            return
+        self.logger.info('更新pip到最新版本')
+        returncode = self._run_streaming([str(python_path), '-m', 'pip', 'install', '--upgrade', 'pip'])
+        if returncode != 0:
+            self.logger.warning(f'更新pip失败，返回码：{returncode}')
+            return
+        _touch_pip_marker(env_path)
+    
+    def _install_from_requirements(self, env_path: Path, *requirements_paths: Path) -> bool:
+        """从一个或多个requirements.txt安装依赖"""
+        try:
+            self.logger.info(f'开始从 {", ".join(map(str, requirements_paths))} 安装依赖')
+            # 获取虚拟环境中的python解释器路径
+            _, python_path = _venv_bins(env_path)
+            self.logger.info(f'使用Python路径: {python_path}')
             
-            # 更新pip本身
-            self.logger.info('更新pip到最新版本')
-            update_result = subprocess.run(
-                [str(pip_path), 'install', '--upgrade', 'pip'],
-                capture_output=True,
-                text=True
-            )
-            if update_result.returncode != 0:
-                self.logger.warning(f'更新pip失败: {update_result.stderr}')
+            self._upgrade_pip(env_path, python_path)
             
             # 安装依赖
             self.logger.info('开始安装依赖包')
-            result = subprocess.run(
-                [str(pip_path), 'install', '-r', str(requirements_path)],
-                capture_output=True,
-                text=True
-            )
+            cmd = [str(python_path), '-m', 'pip', 'install']
+            for requirements_path in requirements_paths:
+                cmd += ['-r', str(requirements_path)]
+            returncode = self._run_streaming(cmd)
             
-            if result.returncode != 0:
-                self.logger.error(f'pip安装依赖失败，返回码：{result.returncode}')
-                self.logger.error(f'pip输出：\n{result.stdout}')
-                self.logger.error(f'pip错误：\n{result.stderr}')
+            if returncode != 0:
+                self.logger.error(f'pip安装依赖失败，返回码：{returncode}')
                 return False
-            
-            self.logger.info(f'pip安装输出：\n{result.stdout}')
             return True
         except Exception as e:
             self.logger.error(f'从requirements.txt安装依赖失败: {str(e)}')
-            import traceback
             self.logger.error(f'错误堆栈：\n{traceback.format_exc()}')
             return False
     
@@ -300,32 +446,23 @@ class EnvironmentManager:
         try:
             self.logger.info(f'开始从 {setup_path} 安装依赖')
             # 获取虚拟环境中的python解释器路径
-            if os.name == 'nt':
-                python_path = env_path / 'Scripts' / 'python'
-            else:
-                python_path = env_path / 'bin' / 'python'
+            _, python_path = _venv_bins(env_path)
             self.logger.info(f'使用Python路径: {python_path}')
             
             # 安装依赖
             self.logger.info('开始执行setup.py install')
-            result = subprocess.run(
+            returncode = self._run_streaming(
                 [str(python_path), 'setup.py', 'install'],
-                cwd=setup_path.parent,
-                capture_output=True,
-                text=True
+                cwd=setup_path.parent
             )
             
-            if result.returncode != 0:
-                self.logger.error(f'setup.py安装失败，返回码：{result.returncode}')
-                self.logger.error(f'安装输出：\n{result.stdout}')
-                self.logger.error(f'安装错误：\n{result.stderr}')
+            if returncode != 0:
+                self.logger.error(f'setup.py安装失败，返回码：{returncode}')
                 return False
             
-            self.logger.info(f'setup.py安装输出：\n{result.stdout}')
             return True
         except Exception as e:
             self.logger.error(f'从setup.py安装依赖失败: {str(e)}')
-            import traceback
             self.logger.error(f'错误堆栈：\n{traceback.format_exc()}')
             return False
     
@@ -333,32 +470,22 @@ class EnvironmentManager:
         """从pyproject.toml安装依赖"""
         try:
             self.logger.info(f'开始从 {pyproject_path} 安装依赖')
-            # 获取虚拟环境中的pip路径
-            if os.name == 'nt':
-                pip_path = env_path / 'Scripts' / 'pip'
-            else:
-                pip_path = env_path / 'bin' / 'pip'
-            self.logger.info(f'使用pip路径: {pip_path}')
+            # 获取虚拟环境中的python解释器路径
+            _, python_path = _venv_bins(env_path)
+            self.logger.info(f'使用Python路径: {python_path}')
             
-            # 安装依赖
+            self._upgrade_pip(env_path, python_path)
+            
+            # 安装项目及其依赖
             self.logger.info('开始安装项目及其依赖')
-            result = subprocess.run(
-                [str(pip_path), 'install', str(pyproject_path.parent)],
-                capture_output=True,
-                text=True
-            )
+            returncode = self._run_streaming([str(python_path), '-m', 'pip', 'install', str(pyproject_path.parent)])
             
-            if result.returncode != 0:
-                self.logger.error(f'pyproject.toml安装失败，返回码：{result.returncode}')
-                self.logger.error(f'安装输出：\n{result.stdout}')
-                self.logger.error(f'安装错误：\n{result.stderr}')
+            if returncode != 0:
+                self.logger.error(f'pyproject.toml安装失败，返回码：{returncode}')
                 return False
-            
-            self.logger.info(f'pyproject.toml安装输出：\n{result.stdout}')
             return True
         except Exception as e:
             self.logger.error(f'从pyproject.toml安装依赖失败: {str(e)}')
-            import traceback
             self.logger.error(f'错误堆栈：\n{traceback.format_exc()}')
             return False
     
@@ -370,10 +497,7 @@ class EnvironmentManager:
         """检查setup.py中的依赖是否已安装"""
         try:
             # 获取虚拟环境中的python解释器路径
-            if os.name == 'nt':
-                python_path = env_path / 'Scripts' / 'python'
-            else:
-                python_path = env_path / 'bin' / 'python'
+            _, python_path = _venv_bins(env_path)
             
             # 运行setup.py egg_info获取依赖信息
             result = subprocess.run(
@@ -387,7 +511,7 @@ class EnvironmentManager:
                 return False
             
             # 检查已安装的包
-            return self._check_installed_packages(env_path)
+            return self._check_installed_packages(env_path) is not None
             
         except Exception as e:
             self.logger.error(f'检查setup.py依赖失败: {str(e)}')
@@ -395,65 +519,116 @@ class EnvironmentManager:
     
     def _check_pyproject_toml(self, env_path: Path, pyproject_path: Path) -> bool:
         """检查pyproject.toml中的依赖是否已安装"""
-        try:            
+        try:
+            # 按需加载TOML解析器，Python 3.11+使用内置的tomllib
+            try:
+                import tomllib as tomli
+            except ImportError:
+                import tomli
+            
             # 读取pyproject.toml
             with open(pyproject_path, 'rb') as f:
                 pyproject_data = tomli.load(f)
             
-            # 获取依赖列表
-            dependencies = []
-            if 'project' in pyproject_data:
-                if 'dependencies' in pyproject_data['project']:
-                    dependencies.extend(pyproject_data['project']['dependencies'])
-                if 'optional-dependencies' in pyproject_data['project']:
-                    for extra_deps in pyproject_data['project']['optional-dependencies'].values():
-                        dependencies.extend(extra_deps)
-            
             # 检查已安装的包
-            return self._check_installed_packages(env_path)
+            installed_packages = self._check_installed_packages(env_path)
+            if installed_packages is None:
+                return False
+            
+            # 检查项目声明的依赖是否都已安装且版本满足要求
+            # 安装时不会带上extras，因此不检查optional-dependencies
+            for dep in pyproject_data.get('project', {}).get('dependencies', []):
+                try:
+                    req = Requirement(dep)
+                except InvalidRequirement:
+                    # 如果解析依赖字符串失败，跳过该依赖
+                    continue
+                if not _is_satisfied(req, installed_packages):
+                    self.logger.warning(f'依赖未安装或版本不满足要求: {dep}')
+                    return False
+            return True
             
         except Exception as e:
             self.logger.error(f'检查pyproject.toml依赖失败: {str(e)}')
             return False
     
-    def _check_installed_packages(self, env_path: Path) -> bool:
-        """检查已安装的包，使用dist-metadata直接读取包信息"""
+    def _check_installed_packages(self, env_path: Path) -> Optional[dict]:
+        """检查已安装的包，使用dist-metadata直接读取包信息
+        
+        只读取METADATA文件头部的Name/Version字段，不读取包的长描述。
+        
+        Returns:
+            Optional[dict]: 规范化包名到版本的映射，site-packages不存在或读取失败时返回None
+        """
         try:
             # 获取虚拟环境的site-packages路径
-            if os.name == 'nt':
-                site_packages = env_path / 'Lib' / 'site-packages'
-            else:
-                site_packages = env_path / 'lib' / f'python{sys.version_info.major}.{sys.version_info.minor}' / 'site-packages'
+            site_packages = _site_packages(env_path)
             
             if not site_packages.exists():
-                return False
+                return None
             
             # 直接读取dist-info目录获取已安装的包信息
-            success = True
-            for dist_info in site_packages.glob('*.dist-info'):
-                metadata_path = dist_info / 'METADATA'
-                if not metadata_path.exists():
-                    continue
-                
-                try:
-                    with open(metadata_path, 'r', encoding='utf-8') as f:
-                        metadata = f.read()
-                    # 这里可以解析metadata获取更详细的包信息
-                    # 为了简化示例，我们只验证metadata文件是否可读
-                except Exception:
-                    success = False
-                    break
-            
-            return success
+            return _enumerate_installed(env_path)
             
         except Exception as e:
             self.logger.error(f'检查已安装包失败: {str(e)}')
-            return False
+            return None
+
+@functools.lru_cache(maxsize=None)
+def _get_environment_manager(base_path: Path) -> EnvironmentManager:
+    return EnvironmentManager(base_path)
+
+
+def get_environment_manager(base_path: Optional[Path] = None) -> EnvironmentManager:
+    """获取环境管理器实例
+    
+    同一项目根目录共享同一个实例，未指定base_path时使用项目根目录。
+    """
+    return _get_environment_manager(Path(base_path or _PROJECT_ROOT).resolve())
+
+@functools.lru_cache(maxsize=256)
+def _parse_requirements(path: str, mtime_ns: int) -> tuple:
+    """解析requirements.txt中的依赖声明
+    
+    mtime_ns参与缓存键，文件修改后会自动重新解析。无法解析的行会被跳过。
+    
+    Args:
+        path: requirements.txt文件路径
+        mtime_ns: 文件修改时间（纳秒）
+    
+    Returns:
+        tuple: packaging.requirements.Requirement对象元组
+    """
+    requirements = []
+    with open(path, 'r') as f:
+        for line in f:
+            req_str = line.strip()
+            if not req_str or req_str.startswith('#'):
+                continue
+            try:
+                requirements.append(Requirement(req_str))
+            except InvalidRequirement:
+                # 如果解析依赖字符串失败，跳过该依赖
+                continue
+    return tuple(requirements)
+
+def _is_satisfied(req: Requirement, installed_packages: dict) -> bool:
+    """检查单个依赖是否已安装且版本满足要求
+    
+    环境标记不适用于当前解释器（虚拟环境由当前解释器创建）的依赖视为已满足。
+    """
+    if req.marker and not req.marker.evaluate():
+        return True
+    version = installed_packages.get(canonicalize_name(req.name))
+    if version is None:
+        return False
+    return not req.specifier or req.specifier.contains(str(version))
+
 
 def check_dependencies(venv_dir: Path, requirements_path: Path) -> bool:
     """检查服务依赖是否已安装
     
-    使用pip的packaging模块来准确解析和比对包的版本信息。
+    直接读取虚拟环境中的dist-info元数据，并使用packaging模块准确解析和比对包的版本信息。
     
     Args:
         venv_dir: 虚拟环境目录
@@ -463,58 +638,14 @@ def check_dependencies(venv_dir: Path, requirements_path: Path) -> bool:
         bool: 依赖检查是否通过
     """
     try:
-        # 获取虚拟环境中的pip路径
-        if os.name == 'nt':
-            pip_path = venv_dir / 'Scripts' / 'pip'
-        else:
-            pip_path = venv_dir / 'bin' / 'pip'
-        
-        # 获取已安装的包信息
-        result = subprocess.run(
-            [str(pip_path), 'list', '--format=json'],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0:
-            return False
-        
-        # 解析已安装的包信息
-        import json
-        from packaging.requirements import Requirement
-        from packaging.version import Version, InvalidVersion
-        from packaging.utils import canonicalize_name
-        
-        installed_packages = {}
-        for pkg in json.loads(result.stdout):
-            try:
-                installed_packages[canonicalize_name(pkg['name'])] = Version(pkg['version'])
-            except InvalidVersion:
-                continue
-        
-        # 读取并解析requirements.txt
-        with open(requirements_path, 'r') as f:
-            required = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        # 直接读取dist-info获取已安装的包信息
+        installed_packages = _enumerate_installed(venv_dir)
         
-        # 检查每个依赖是否满足要求
-        for req_str in required:
-            try:
-                req = Requirement(req_str)
-                pkg_name = canonicalize_name(req.name)
-                
-                # 检查包是否已安装
-                if pkg_name not in installed_packages:
-                    return False
-                
-                # 检查版本是否满足要求
-                if req.specifier and not req.specifier.contains(str(installed_packages[pkg_name])):
-                    return False
-                    
-            except Exception:
-                # 如果解析依赖字符串失败，跳过该依赖
-                continue
+        # 读取并解析requirements.txt（按文件修改时间缓存）
+        required = _parse_requirements(str(requirements_path), requirements_path.stat().st_mtime_ns)
         
-        return True
+        # 检查每个依赖是否已安装且版本满足要求
+        return all(_is_satisfied(req, installed_packages) for req in required)
         
     except Exception as e:
         return False
\ No newline at end of file
@@ -3,10 +3,18 @@
 负责管理服务的元数据信息，包括服务配置、版本等。
 """
 
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from pathlib import Path
-import json
+import os
 from src.utils.logger import logger
+from src.utils.json_utils import loads as _loads, dumps as _dumps
+
+# 元数据文件不存在时的缓存占位
+_MISSING = object()
+
+# 服务定义中的必需字段
+_REQUIRED_FIELDS = frozenset({'name', 'version', 'api_routes', 'dependencies'})
+
 
 class ServiceMetadataManager:
     """服务元数据管理器
@@ -19,23 +27,29 @@ class ServiceMetadataManager:
             raise ValueError("repo_path不能为空")
         self.repo_path = repo_path.resolve()
         self.metadata_cache: Dict[str, dict] = {}
+        # 服务定义解析缓存: service.json路径 -> (st_mtime_ns, st_size, 校验后的元数据)
+        self.parsed_cache: Dict[str, Tuple[int, int, Optional[dict]]] = {}
     
     def get_service_metadata(self, service_name: str) -> Optional[dict]:
-        """获取服务元数据"""
+        """获取服务元数据
+        
+        元数据文件不存在的结果同样会被缓存，文件新增后需调用clear_metadata_cache使其失效。
+        """
         if service_name in self.metadata_cache:
-            return self.metadata_cache[service_name]
+            metadata = self.metadata_cache[service_name]
+            return None if metadata is _MISSING else metadata
         
         service_dir = self.repo_path / service_name
         metadata_path = service_dir / 'service.json'
         
         if not metadata_path.exists():
+            self.metadata_cache[service_name] = _MISSING
             return None
         
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                self.metadata_cache[service_name] = metadata
-                return metadata
+            metadata = _loads(metadata_path.read_bytes())
+            self.metadata_cache[service_name] = metadata
+            return metadata
         except Exception as e:
             logger.error(f'读取服务元数据失败: {str(e)}')
             return None
@@ -84,8 +98,7 @@ class ServiceMetadataManager:
             service_dir = self.repo_path / service_name
             metadata_path = service_dir / 'service.json'
             
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, indent=4, ensure_ascii=False)
+            metadata_path.write_bytes(_dumps(metadata))
             
             self.metadata_cache[service_name] = metadata
             return True
@@ -97,8 +110,10 @@ class ServiceMetadataManager:
         """清除元数据缓存"""
         if service_name:
             self.metadata_cache.pop(service_name, None)
+            self.parsed_cache.pop(str(self.repo_path / service_name / 'service.json'), None)
         else:
             self.metadata_cache.clear()
+            self.parsed_cache.clear()
             
     def parse_service_metadata(self, service_path: Path) -> Optional[dict]:
         """解析服务定义文件
@@ -111,25 +126,32 @@ class ServiceMetadataManager:
         """
         try:
             metadata_path = service_path / 'service.json'
-            if not metadata_path.exists():
+            try:
+                stat = os.stat(metadata_path)
+            except FileNotFoundError:
                 logger.warning(f'服务定义文件不存在: {metadata_path}')
                 return None
             
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-                
-            if self._validate_metadata(metadata):
-                return metadata
-            return None
+            # 文件未变化时直接返回缓存的解析及校验结果
+            cache_key = str(metadata_path)
+            cached = self.parsed_cache.get(cache_key)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                return dict(cached[2]) if cached[2] is not None else None
+            
+            metadata = _loads(metadata_path.read_bytes())
+            
+            if not self._validate_metadata(metadata):
+                metadata = None
+            self.parsed_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, metadata)
+            return dict(metadata) if metadata is not None else None
         except Exception as e:
             logger.error(f'解析服务定义失败: {str(e)}')
             return None
             
     def _validate_metadata(self, metadata: dict) -> bool:
         """验证服务元数据"""
-        required_fields = ['name', 'version', 'api_routes', 'dependencies']
-        for field in required_fields:
-            if field not in metadata:
-                logger.warning(f'服务定义缺少必需字段: {field}')
-                return False
+        missing = _REQUIRED_FIELDS - metadata.keys()
+        if missing:
+            logger.warning(f'服务定义缺少必需字段: {", ".join(sorted(missing))}')
+            return False
         return True
\ No newline at end of file
@@ -4,209 +4,443 @@
 """
 
 import os
+import asyncio
+import functools
+import random
+import selectors
+import socket
 import subprocess
-import requests
+import threading
+import weakref
+import httpx
 import sys
-import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Optional, Any
-from src.core.environment import EnvironmentManager
-from src.core.discovery import ServiceDiscovery
+from src.core.environment import get_environment_manager
+from src.core.discovery import get_discovery
 from src.core.metadata import ServiceMetadataManager
 from src.utils.logger import logger
 
+# 服务启动等待的退避参数（秒）
+_BACKOFF_BASE = 0.02
+_BACKOFF_CAP = 1.0
+_STARTUP_TIMEOUT = 15
+
+# 服务初始化请求的超时时间，连接超时1秒，读取超时30秒
+_HTTP_TIMEOUT = httpx.Timeout(30.0, connect=1.0)
+
+
+def _backoff_delay(attempt: int) -> float:
+    """计算第attempt次重试前的等待时间（指数退避 + 完全抖动）"""
+    return random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * (2 ** attempt)))
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """打开子进程的pidfd（Linux 5.3+），不支持时返回None"""
+    if not hasattr(os, 'pidfd_open'):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def _wait_exit(process: subprocess.Popen, timeout: float) -> bool:
+    """等待子进程退出
+    
+    支持pidfd时在selector上等待进程退出事件，否则回退到process.wait。
+    
+    Returns:
+        bool: 进程是否在超时前退出
+    """
+    # 进程已被回收时其PID可能已被复用，不能再打开pidfd
+    if process.returncode is not None:
+        return True
+    pidfd = _open_pidfd(process.pid)
+    if pidfd is None:
+        try:
+            process.wait(timeout=timeout)
+            return True
+        except subprocess.TimeoutExpired:
+            return False
+    
+    try:
+        with selectors.DefaultSelector() as sel:
+            sel.register(pidfd, selectors.EVENT_READ)
+            if not sel.select(timeout):
+                return False
+    finally:
+        os.close(pidfd)
+    # 进程已退出，回收子进程
+    process.wait()
+    return True
+
+
+def _read_log_tail(log_fd: int, max_bytes: int = 8192) -> str:
+    """读取日志文件末尾最多max_bytes字节的内容
+    
+    日志文件以追加模式打开，移动读取位置不影响子进程的写入位置。
+    """
+    size = os.fstat(log_fd).st_size
+    offset = max(0, size - max_bytes)
+    os.lseek(log_fd, offset, os.SEEK_SET)
+    return os.read(log_fd, size - offset).decode('utf-8', 'replace').strip()
+
+
+def _terminate(process: subprocess.Popen) -> None:
+    """终止子进程，5秒内未退出则强制结束"""
+    process.terminate()
+    if not _wait_exit(process, 5):
+        process.kill()
+        process.wait()
+
+
+def _service_status(entry: dict) -> dict:
+    """根据running_services中的记录生成服务进程状态"""
+    process = entry['process']
+    return {
+        'running': process.poll() is None,
+        'port': entry['port'],
+        'status': entry['status'],
+        'process': process
+    }
+
+
 class ServiceProcessManager:
     """服务进程管理器
     
     负责管理服务进程的创建、监控和生命周期管理。
-    使用单例模式确保全局只有一个实例。
+    通过get_process_manager获取全局共享的实例。
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
-        if self._initialized:
-            return
-        self.discovery = ServiceDiscovery()
-        self.environment_manager = EnvironmentManager()
+        self.discovery = get_discovery()
+        self.environment_manager = get_environment_manager()
         services_path = self.discovery.services_path
         if not services_path:
             logger.error('无法获取服务路径')
             raise ValueError('无法获取服务路径')
         self.metadata_manager = ServiceMetadataManager(services_path)
         self.running_services: Dict[str, subprocess.Popen] = {}
-        self._initialized = True
+        # 服务在后台事件循环线程中启动，在界面线程中停止和查询，修改和遍历running_services时加锁
+        self._services_lock = threading.Lock()
+        # 服务信息缓存: 服务名称 -> {'info': 服务信息, 'impl_path': 实现文件路径, 'route_index': 路由索引, 'execute_route': 执行路由}
+        # scan_services会生成新的服务信息对象，对象变化或服务停止时缓存失效
+        self._info_cache: Dict[str, dict] = {}
+        # 异步HTTP客户端与事件循环绑定，每个事件循环使用各自的客户端
+        self._aclients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        # 同步调用使用的后台事件循环，首次使用时启动
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        # 服务日志文件描述符: 服务名称 -> fd，在服务停止时关闭
+        self._log_fds: Dict[str, int] = {}
+        # 服务进程继承的基础环境变量，只在创建管理器时复制一次
+        self._base_env: Dict[str, str] = dict(os.environ)
     
-    def start_service(self, service_name: str, config: dict) -> dict:
-        try:
-            # 获取服务信息
-            service_info = self.discovery.get_service_info(service_name)
-            if not service_info:
-                logger.error(f'服务 {service_name} 信息不存在')
-                return {'success': False, 'error': f'服务 {service_name} 信息不存在'}
-            
-            logger.info(f'开始启动服务: {service_name}')
-            logger.debug(f'服务配置信息: {service_info}')
-            
-            # 获取服务路径
-            service_path = self.metadata_manager.get_service_implementation_path(service_name)
-            if not service_path:
-                logger.error(f'服务 {service_name} 实现文件不存在')
-                return {'success': False, 'error': f'服务 {service_name} 实现文件不存在'}
-            
-            # 获取服务环境变量
-            env_vars = service_info.get('environment', {}).get('env_vars', {})
-            if not env_vars:
-                logger.error(f'服务 {service_name} 未定义环境变量')
-                return {'success': False, 'error': f'服务 {service_name} 未定义环境变量'}
-            
-            # 获取服务端口
-            original_port = int(env_vars.get('PORT', 0))
-            if not original_port:
-                logger.error(f'服务 {service_name} 未定义端口')
-                return {'success': False, 'error': f'服务 {service_name} 未定义端口'}
-            
-            # 检查端口是否被占用，如果被占用则尝试终止占用进程
-            if self.is_port_in_use(original_port):
-                logger.info(f'端口 {original_port} 被占用，尝试终止占用进程')
-                if not self.kill_process_by_port(original_port):
-                    logger.error(f'无法终止占用端口 {original_port} 的进程')
-                    return {'success': False, 'error': f'无法终止占用端口 {original_port} 的进程'}
-                logger.info(f'成功终止占用端口 {original_port} 的进程')
-            
-            port = original_port
-            
-            # 准备环境变量
-            env = os.environ.copy()
-            for key, value in {**env_vars, **config}.items():
-                env[key] = str(value)
-            
-            # 准备启动命令
-            cmd = [
-                sys.executable,
-                '-m', 'uvicorn',
-                f'src.services.implementations.{service_name}.service:app',
-                '--host', '0.0.0.0',
-                '--port', str(port),
-                '--log-level', 'info'
-            ]
-            
-            # 创建日志目录和文件
+    def _get_aclient(self) -> httpx.AsyncClient:
+        """获取当前事件循环对应的异步HTTP客户端"""
+        loop = asyncio.get_running_loop()
+        client = self._aclients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=64, max_connections=256),
+                timeout=httpx.Timeout(30.0)
+            )
+            self._aclients[loop] = client
+        return client
+    
+    def _run_sync(self, coro) -> Any:
+        """在后台事件循环中运行协程并等待结果
+        
+        后台事件循环常驻，其HTTP客户端的keep-alive连接可以在多次同步调用之间复用。
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='ServiceProcessManagerLoop', daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def _get_log_fd(self, service_name: str) -> int:
+        """获取服务日志文件描述符，首次使用时创建日志文件并保持打开"""
+        log_fd = self._log_fds.get(service_name)
+        if log_fd is None:
             log_dir = Path('logs')
             log_dir.mkdir(exist_ok=True)
-            log_file = log_dir / f'{service_name}.log'
+            log_fd = os.open(
+                str(log_dir / f'{service_name}.log'),
+                os.O_RDWR | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0),
+                0o644
+            )
+            self._log_fds[service_name] = log_fd
+        return log_fd
+    
+    def _close_log_fd(self, service_name: str) -> None:
+        """关闭服务日志文件描述符"""
+        log_fd = self._log_fds.pop(service_name, None)
+        if log_fd is not None:
+            os.close(log_fd)
+    
+    def _cached_info(self, service_name: str) -> Optional[dict]:
+        """获取服务信息及实现文件路径
+        
+        服务信息对象未变化时复用缓存，避免每次调用都检查实现文件是否存在。
+        
+        Returns:
+            Optional[dict]: 包含info、impl_path、route_index和execute_route的缓存项，服务不存在时返回None
+        """
+        service_info = self.discovery.get_service_info(service_name)
+        if not service_info:
+            self._info_cache.pop(service_name, None)
+            return None
+        
+        cached = self._info_cache.get(service_name)
+        if cached is None or cached['info'] is not service_info:
+            # 按请求方法索引路由，每种方法只保留第一个
+            route_index = {}
+            api_routes = service_info.get('api_routes')
+            if isinstance(api_routes, list):
+                for route in api_routes:
+                    method = str(route.get('method', 'POST')).upper()
+                    route_index.setdefault(method, route)
+            cached = {
+                'info': service_info,
+                'impl_path': self.metadata_manager.get_service_implementation_path(service_name),
+                'route_index': route_index,
+                # 执行路由：优先使用第一个POST路由，没有POST路由时使用第一个路由
+                'execute_route': route_index.get('POST') or (api_routes[0] if isinstance(api_routes, list) and api_routes else None)
+            }
+            self._info_cache[service_name] = cached
+        return cached
+    
+    def get_execute_route(self, service_name: str) -> Optional[dict]:
+        """获取execute_service调用的API路由，服务不存在或未定义路由时返回None"""
+        cached = self._cached_info(service_name)
+        return cached['execute_route'] if cached else None
+    
+    def _launch_service(self, service_name: str, config: dict) -> dict:
+        """校验服务信息并启动服务进程，不等待服务就绪
+        
+        Returns:
+            dict: 失败时包含success和error；成功时包含success、process、port、info和log_fd
+        """
+        # 获取服务信息
+        cached = self._cached_info(service_name)
+        service_info = cached['info'] if cached else None
+        if not service_info:
+            logger.error('服务 %s 信息不存在', service_name)
+            return {'success': False, 'error': f'服务 {service_name} 信息不存在'}
+        
+        logger.info('开始启动服务: %s', service_name)
+        logger.debug('服务配置信息: %s', service_info)
+        
+        # 获取服务路径
+        service_path = cached['impl_path']
+        if not service_path:
+            logger.error('服务 %s 实现文件不存在', service_name)
+            return {'success': False, 'error': f'服务 {service_name} 实现文件不存在'}
+        
+        # 获取服务环境变量
+        env_vars = service_info.get('environment', {}).get('env_vars', {})
+        if not env_vars:
+            logger.error('服务 %s 未定义环境变量', service_name)
+            return {'success': False, 'error': f'服务 {service_name} 未定义环境变量'}
+        
+        # 获取服务端口
+        original_port = int(env_vars.get('PORT', 0))
+        if not original_port:
+            logger.error('服务 %s 未定义端口', service_name)
+            return {'success': False, 'error': f'服务 {service_name} 未定义端口'}
+        
+        # 检查端口是否被占用，如果被占用则尝试终止占用进程
+        if self.is_port_in_use(original_port):
+            logger.info('端口 %s 被占用，尝试终止占用进程', original_port)
+            if not self.kill_process_by_port(original_port):
+                logger.error('无法终止占用端口 %s 的进程', original_port)
+                return {'success': False, 'error': f'无法终止占用端口 {original_port} 的进程'}
+            logger.info('成功终止占用端口 %s 的进程', original_port)
+        
+        port = original_port
+        
+        # 准备环境变量
+        env = self._base_env | {key: str(value) for key, value in (env_vars | config).items()}
+        
+        # 准备启动命令
+        cmd = [
+            sys.executable,
+            '-m', 'uvicorn',
+            f'src.services.implementations.{service_name}.service:app',
+            '--host', '0.0.0.0',
+            '--port', str(port),
+            '--log-level', 'info'
+        ]
+        
+        # 获取日志文件描述符，并清空上次运行的日志
+        log_fd = self._get_log_fd(service_name)
+        os.ftruncate(log_fd, 0)
+        
+        # 启动服务进程
+        logger.info('启动服务进程: %s', ' '.join(cmd))
+        # Linux上CPython 3.10+的Popen在未指定preexec_fn/user/group时使用vfork启动子进程，
+        # 不复制父进程页表；os.posix_spawn不支持设置cwd，因此保留Popen，且不要添加上述参数
+        process = subprocess.Popen(
+            cmd,
+            env=env,
+            cwd=service_path.parent,
+            stdin=subprocess.DEVNULL,
+            stdout=log_fd,
+            stderr=subprocess.STDOUT,
+            start_new_session=True
+        )
+        return {'success': True, 'process': process, 'port': port, 'info': service_info, 'log_fd': log_fd}
+    
+    async def _await_ready(self, port: int, process: subprocess.Popen, pidfd: Optional[int]) -> bool:
+        """等待服务端口可连接
+        
+        连接被拒绝时按指数退避重试。传入pidfd时通过loop.add_reader同时等待子进程退出，
+        子进程退出后立即返回。
+        
+        Returns:
+            bool: 端口是否可连接，进程退出时返回False
+        """
+        loop = asyncio.get_running_loop()
+        exited = loop.create_future()
+        if pidfd is not None:
+            loop.add_reader(pidfd, lambda: exited.done() or exited.set_result(None))
+        try:
+            attempt = 0
+            while process.poll() is None:
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                    sock.setblocking(False)
+                    try:
+                        await loop.sock_connect(sock, ('127.0.0.1', port))
+                        return True
+                    except OSError:
+                        pass
+                await asyncio.wait({exited}, timeout=_backoff_delay(attempt))
+                attempt += 1
+            return False
+        finally:
+            if pidfd is not None:
+                loop.remove_reader(pidfd)
+    
+    def start_service_sync(self, service_name: str, config: dict) -> dict:
+        """同步启动服务，供非异步调用方使用，参数和返回值同start_service"""
+        return self._run_sync(self.start_service(service_name, config))
+    
+    async def start_services(self, services: Dict[str, dict]) -> Dict[str, dict]:
+        """并发启动多个服务
+        
+        Args:
+            services: 服务名称 -> 启动配置
+        
+        Returns:
+            Dict[str, dict]: 服务名称 -> start_service的返回结果
+        """
+        results = await asyncio.gather(*(self.start_service(name, config) for name, config in services.items()))
+        return dict(zip(services, results))
+    
+    async def start_service(self, service_name: str, config: dict) -> dict:
+        """启动服务进程并等待服务就绪
+        
+        进程启动在线程池中执行，就绪等待和初始化请求在事件循环中进行，
+        多个服务可以通过start_services并发启动。
+        
+        Args:
+            service_name: 服务名称
+            config: 覆盖服务环境变量的配置
+        
+        Returns:
+            dict: 启动结果，包含success以及port或error
+        """
+        loop = asyncio.get_running_loop()
+        pidfd = None
+        try:
+            launched = await loop.run_in_executor(None, self._launch_service, service_name, config)
+            if not launched['success']:
+                return launched
+            process = launched['process']
+            port = launched['port']
+            service_info = launched['info']
+            # 子进程退出时pidfd变为可读，与端口等待一起由事件循环监听
+            pidfd = _open_pidfd(process.pid)
             
-            # 启动服务进程
-            logger.info(f'启动服务进程: {" ".join(cmd)}')
-            with open(log_file, 'w') as log_fp:
-                process = subprocess.Popen(
-                    cmd,
-                    env=env,
-                    cwd=service_path.parent,
-                    stdout=log_fp,
-                    stderr=subprocess.STDOUT,
-                    start_new_session=True
-                )
+            try:
+                ready = await asyncio.wait_for(self._await_ready(port, process, pidfd), timeout=_STARTUP_TIMEOUT)
+            except asyncio.TimeoutError:
+                # 启动超时，终止进程
+                await loop.run_in_executor(None, _terminate, process)
+                logger.error('服务启动超时')
+                return {'success': False, 'error': '服务启动超时'}
             
-            # 等待服务启动
-            max_retries = 10
-            retry_interval = 0.5
-            for i in range(max_retries):
-                if process.poll() is not None:
-                    # 进程已退出，读取日志文件获取错误信息
-                    error_message = ''
-                    try:
-                        with open(log_file, 'r') as f:
-                            error_message = f.read().strip()
-                    except Exception as e:
-                        logger.error(f'读取日志文件失败: {str(e)}')
-                    
-                    logger.error(f'服务进程异常退出，退出码: {process.returncode}，错误信息: {error_message}')
-                    return {'success': False, 'error': f'服务进程异常退出，退出码: {process.returncode}，错误信息: {error_message}'}
+            if not ready:
+                # 进程已退出，读取日志文件获取错误信息
+                error_message = ''
+                try:
+                    error_message = _read_log_tail(launched['log_fd'])
+                except Exception as e:
+                    logger.error('读取日志文件失败: %s', e)
                 
-                # 检查端口是否被进程占用
-                if self.is_port_in_use(port):
-                    # 检查进程是否还在运行
-                    if process.poll() is None:
-                        # 服务启动成功
-                        server_status = {'is_ready': True, 'error': None}
-                        # 保存服务信息
-                        self.running_services[service_name] = {
-                            'process': process,
-                            'port': port,
-                            'status': server_status,
-                            'start_time': datetime.now().isoformat()
-                        }
-                        logger.info(f'服务 {service_name} 启动成功')
-                        # 添加初始化请求重试机制
-                        init_max_retries = 3
-                        init_retry_interval = 0.5
-                        init_url = f'http://localhost:{port}/init'
-                        
-                        for init_retry in range(init_max_retries):
-                            try:
-                                # 检查服务进程是否仍在运行
-                                if process.poll() is not None:
-                                    error_message = '服务进程已退出'
-                                    logger.error(f'服务 {service_name} 初始化失败: {error_message}')
-                                    return {'success': False, 'error': f'服务初始化失败: {error_message}'}
-                                
-                                response = requests.post(init_url, json=service_info)
-                                response.raise_for_status()
-                                logger.info(f'服务 {service_name} 初始化成功')
-                                return {'success': True, 'port': port, 'status': 'running', 'message': f'服务已启动，监听端口: {port}'}
-                            except Exception as e:
-                                if init_retry < init_max_retries - 1:
-                                    logger.warning(f'服务 {service_name} 初始化重试 ({init_retry + 1}/{init_max_retries}): {str(e)}')
-                                    time.sleep(init_retry_interval)
-                                else:
-                                    logger.error(f'服务 {service_name} 初始化失败: {str(e)}')
-                                    # 初始化失败，终止进程
-                                    process.terminate()
-                                    try:
-                                        process.wait(timeout=5)
-                                    except subprocess.TimeoutExpired:
-                                        process.kill()
-                                    return {'success': False, 'error': f'服务初始化失败: {str(e)}'}
-                                        
-                logger.info(f'等待服务启动 ({i+1}/{max_retries})...')
-                time.sleep(retry_interval)
+                logger.error('服务进程异常退出，退出码: %s，错误信息: %s', process.returncode, error_message)
+                return {'success': False, 'error': f'服务进程异常退出，退出码: {process.returncode}，错误信息: {error_message}'}
             
-            # 启动超时，终止进程
-            process.terminate()
-            try:
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
+            # 服务启动成功，保存服务信息
+            base_url = f'http://localhost:{port}'
+            with self._services_lock:
+                self.running_services[service_name] = {
+                    'process': process,
+                    'port': port,
+                    'base_url': base_url,
+                    'status': {'is_ready': True, 'error': None},
+                    'start_time': datetime.now().isoformat()
+                }
+            logger.info('服务 %s 启动成功', service_name)
             
-            logger.error('服务启动超时')
-            return {'success': False, 'error': '服务启动超时'}
+            # 添加初始化请求重试机制
+            init_max_retries = 5
+            init_url = f'{base_url}/init'
+            client = self._get_aclient()
+            for init_retry in range(init_max_retries):
+                # 检查服务进程是否仍在运行
+                if process.poll() is not None:
+                    error_message = '服务进程已退出'
+                    logger.error('服务 %s 初始化失败: %s', service_name, error_message)
+                    return {'success': False, 'error': f'服务初始化失败: {error_message}'}
+                try:
+                    response = await client.post(init_url, json=service_info, timeout=_HTTP_TIMEOUT)
+                    response.raise_for_status()
+                    logger.info('服务 %s 初始化成功', service_name)
+                    return {'success': True, 'port': port, 'status': 'running', 'message': f'服务已启动，监听端口: {port}'}
+                except httpx.HTTPError as e:
+                    if init_retry < init_max_retries - 1:
+                        logger.warning('服务 %s 初始化重试 (%s/%s): %s', service_name, init_retry + 1, init_max_retries, e)
+                        await asyncio.sleep(_backoff_delay(init_retry))
+                    else:
+                        logger.error('服务 %s 初始化失败: %s', service_name, e)
+                        # 初始化失败，终止进程
+                        await loop.run_in_executor(None, _terminate, process)
+                        return {'success': False, 'error': f'服务初始化失败: {str(e)}'}
             
         except Exception as e:
-            logger.error(f'启动服务进程失败: {str(e)}')
+            logger.error('启动服务进程失败: %s', e)
             import traceback
-            logger.error(f'错误堆栈:\n{traceback.format_exc()}')
+            logger.error('错误堆栈:\n%s', traceback.format_exc())
             return {'success': False, 'error': f'启动服务进程失败: {str(e)}'}
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
     
     def stop_service(self, service_name: str) -> bool:
         """停止服务进程"""
         try:
-            if service_name in self.running_services:
-                service_info = self.running_services[service_name]
+            service_info = self.running_services.get(service_name)
+            if service_info:
                 process = service_info['process']
-                process.terminate()
-                try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                del self.running_services[service_name]
+                _terminate(process)
+                with self._services_lock:
+                    self.running_services.pop(service_name, None)
+                self._close_log_fd(service_name)
+                # 服务文件可能在停止后被修改，下次使用时重新检查
+                self._info_cache.pop(service_name, None)
                 logger.info(f'服务 {service_name} 已停止')
                 return True
             return False
@@ -219,14 +453,17 @@ class ServiceProcessManager:
         if service_name not in self.running_services:
             return None
         
-        service_info = self.running_services[service_name]
-        process = service_info['process']
-        return {
-            'running': process.poll() is None,
-            'port': service_info['port'],
-            'status': service_info['status'],
-            'process': process
-        }
+        return _service_status(self.running_services[service_name])
+    
+    def get_all_service_statuses(self) -> Dict[str, dict]:
+        """一次获取所有已启动服务的进程状态
+        
+        Returns:
+            Dict[str, dict]: 服务名称到进程状态的映射，状态格式同get_service_status，未启动的服务不在其中
+        """
+        with self._services_lock:
+            entries = list(self.running_services.items())
+        return {name: _service_status(entry) for name, entry in entries}
     
     def monitor_service(self, service_name: str) -> Dict[str, Any]:
         """监控服务进程状态"""
@@ -248,42 +485,72 @@ class ServiceProcessManager:
         Returns:
             bool: 端口是否被占用
         """
-        import socket
         try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('localhost', port))
-                return False
-        except socket.error:
-            return True
-            
+            with socket.create_connection(('127.0.0.1', port), timeout=0.05):
+                return True
+        except OSError:
+            return False
+    
     def kill_process_by_port(self, port: int) -> bool:
         """终止占用指定端口的进程
         
+        优先使用psutil在进程内查找监听该端口的进程，psutil不可用时回退到系统命令。
+        
         Args:
             port: 端口号
             
         Returns:
             bool: 是否成功终止进程
         """
+        try:
+            import psutil
+        except ImportError:
+            return self._kill_process_by_port_cmd(port)
+        
+        try:
+            pids = {
+                conn.pid for conn in psutil.net_connections(kind='inet')
+                if conn.laddr and conn.laddr.port == port and conn.pid and conn.status == psutil.CONN_LISTEN
+            }
+            procs = []
+            for pid in pids:
+                try:
+                    proc = psutil.Process(pid)
+                    proc.kill()
+                    procs.append(proc)
+                except psutil.NoSuchProcess:
+                    continue
+            # 等待进程退出，确保端口已释放
+            psutil.wait_procs(procs, timeout=3)
+            return bool(procs)
+        except Exception as e:
+            logger.error(f'终止进程失败: {str(e)}')
+            return False
+    
+    def _kill_process_by_port_cmd(self, port: int) -> bool:
+        """使用系统命令终止占用指定端口的进程"""
         try:
             if sys.platform.startswith('win'):
-                cmd = ['netstat', '-ano', '|', 'findstr', f':{port}']
-                result = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-                if result.stdout:
-                    pid = result.stdout.strip().split()[-1]
-                    subprocess.run(['taskkill', '/F', '/PID', pid], capture_output=True)
+                result = subprocess.run(['netstat', '-ano'], capture_output=True, text=True)
+                for line in result.stdout.splitlines():
+                    fields = line.split()
+                    if len(fields) >= 5 and fields[1].endswith(f':{port}') and fields[3] == 'LISTENING':
+                        subprocess.run(['taskkill', '/F', '/PID', fields[-1]], capture_output=True)
             else:
                 cmd = ['lsof', '-ti', f':{port}']
                 result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.stdout:
-                    pid = result.stdout.strip()
+                for pid in result.stdout.split():
                     subprocess.run(['kill', '-9', pid], capture_output=True)
             return True
         except Exception as e:
             logger.error(f'终止进程失败: {str(e)}')
             return False
             
-    def execute_service(self, service_name: str, params: dict) -> Any:
+    def execute_service_sync(self, service_name: str, params: dict) -> Any:
+        """同步执行服务调用，供非异步调用方使用，参数和返回值同execute_service"""
+        return self._run_sync(self.execute_service(service_name, params))
+    
+    async def execute_service(self, service_name: str, params: dict) -> Any:
         """执行服务调用
         
         通过HTTP请求调用已启动的服务API接口来执行服务。
@@ -299,66 +566,64 @@ class ServiceProcessManager:
             ValueError: 服务不存在或未启动时抛出
         """
         try:
-            logger.info(f'开始执行服务: {service_name}, 参数: {params}')
+            logger.info('开始执行服务: %s, 参数: %s', service_name, params)
             
             # 检查服务是否存在且已启动
             if service_name not in self.running_services:
-                logger.error(f'服务 {service_name} 未启动')
+                logger.error('服务 %s 未启动', service_name)
                 raise ValueError(f'服务 {service_name} 未启动')
             
             # 获取服务元数据
-            service_info = self.discovery.get_service_info(service_name)
+            cached = self._cached_info(service_name)
+            service_info = cached['info'] if cached else None
             if not service_info or 'api_routes' not in service_info:
-                logger.error(f'服务 {service_name} 元数据不完整')
+                logger.error('服务 %s 元数据不完整', service_name)
                 raise ValueError(f'服务 {service_name} 元数据不完整')
             
             # 获取服务API路由信息
             api_routes = service_info['api_routes']
             if not api_routes or not isinstance(api_routes, list):
-                logger.error(f'服务 {service_name} 未定义API路由')
+                logger.error('服务 %s 未定义API路由', service_name)
                 raise ValueError(f'服务 {service_name} 未定义API路由')
             
-            # 查找第一个POST路由作为执行路由
-            execute_route = None
-            for route in api_routes:
-                execute_route = route
-                break
+            # 优先使用第一个POST路由作为执行路由
+            execute_route = cached['execute_route']
 
             if not execute_route:
-                logger.error(f'服务 {service_name} 未定义接口')
+                logger.error('服务 %s 未定义接口', service_name)
                 raise ValueError(f'服务 {service_name} 未定义接口')
             
             # 构建请求URL
-            base_url = f'http://localhost:{service_info["environment"]["env_vars"]["PORT"]}'
-            execute_url = f'{base_url}{execute_route["path"]}'
+            execute_url = f'{self.running_services[service_name]["base_url"]}{execute_route["path"]}'
             
             # 发送HTTP请求
-            logger.debug(f'发送请求到服务接口: {execute_url}')
-            response = requests.post(execute_url, json=params)
+            logger.debug('发送请求到服务接口: %s', execute_url)
+            response = await self._get_aclient().post(execute_url, json=params)
             response.raise_for_status()
             
             # 处理响应
             result = response.json()
-            logger.info(f'服务 {service_name} 执行成功')
+            logger.info('服务 %s 执行成功', service_name)
             return result
         except Exception as e:
-            logger.error(f'执行服务失败: {str(e)}')
+            logger.error('执行服务失败: %s', e)
             raise
     
     def validate_service(self, service_name: str) -> bool:
-        """验证服务是否可执行"""
+        """验证服务是否可执行
+        
+        实现文件是否存在的结果保存在服务信息缓存中，缓存有效时不访问磁盘。
+        """
         try:
-            # 检查服务信息
-            service_info = self.discovery.get_service_info(service_name)
-            if not service_info:
-                return False
-            
-            # 检查服务路径
-            service_path = self.metadata_manager.get_service_implementation_path(service_name)
-            if not service_path:
-                return False
-            
-            return True
+            # 检查服务信息和服务路径
+            cached = self._cached_info(service_name)
+            return bool(cached and cached['impl_path'])
         except Exception as e:
             logger.error(f'验证服务失败: {str(e)}')
-            return False
\ No newline at end of file
+            return False
+
+
+@functools.lru_cache(maxsize=None)
+def get_process_manager() -> ServiceProcessManager:
+    """获取全局共享的服务进程管理器实例"""
+    return ServiceProcessManager()
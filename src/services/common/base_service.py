@@ -9,27 +9,35 @@ import logging
 import sys
 import json
 import subprocess
+import threading
 from pathlib import Path
-from src.core.environment import EnvironmentManager
+from src.core.environment import get_environment_manager
+from src.utils.json_utils import loads as _loads
 
-class BaseService(ABC):
-    # 配置日志输出
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.DEBUG)
-    
-    # 创建控制台处理器
+
+# 配置日志输出，模块重复导入时不重复添加处理器
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+if not logger.handlers:
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
-    console_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    console_handler.setFormatter(console_formatter)
-    
-    # 添加处理器到日志记录器
+    console_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
     logger.addHandler(console_handler)
+
+
+class BaseService(ABC):
+    logger = logger
+    
+    # 常驻脚本执行进程的入口文件
+    _worker_script = Path(__file__).parent / 'script_worker.py'
     
     def __init__(self):
         self.is_running = False
+        # 常驻脚本执行进程，首次执行脚本时启动
+        self._worker: Optional[subprocess.Popen] = None
+        self._worker_lock = threading.Lock()
         # 初始化环境管理器
-        self.env_manager = EnvironmentManager(Path(self._get_root_path()))
+        self.env_manager = get_environment_manager(Path(self._get_root_path()))
     
     def config(self, config: Dict[str, Any]):
         self.config = config or {}
@@ -37,8 +45,8 @@ class BaseService(ABC):
         if not self.config.get('repo_path'):
             raise ValueError('配置中缺少服务名称(repo_path)字段')
         self.service_name = self.config['repo_path']
-        self.logger.info(f"初始化服务，服务名称: {self.service_name}")
-        self.logger.debug(f"服务配置信息: {self.config}")
+        self.logger.info("初始化服务，服务名称: %s", self.service_name)
+        self.logger.debug("服务配置信息: %s", self.config)
 
     def _get_root_path(self) -> str:
         """获取项目根目录路径"""
@@ -60,12 +68,67 @@ class BaseService(ABC):
         """停止服务"""
         try:
             self.is_running = False
+            self._stop_worker()
             return True
         except Exception:
             return False
     
+    def _spawn_worker(self, python_path: Path) -> subprocess.Popen:
+        """在服务虚拟环境中启动常驻脚本执行进程"""
+        self.logger.debug("启动脚本执行进程: %s", python_path)
+        return subprocess.Popen(
+            [str(python_path), '-u', str(self._worker_script)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            bufsize=0
+        )
+    
+    def _stop_worker(self) -> None:
+        """停止常驻脚本执行进程"""
+        with self._worker_lock:
+            if self._worker is not None:
+                self._worker.kill()
+                self._worker.wait()
+                self._worker = None
+    
+    def _run_in_worker(self, python_path: Path, script: str) -> str:
+        """在常驻进程中执行脚本并返回其标准输出
+        
+        脚本以非零状态退出时抛出subprocess.CalledProcessError，与独立进程执行时的行为一致。
+        常驻进程中已导入的模块及进程级状态会保留到后续脚本，详见script_worker模块说明。
+        """
+        request = (json.dumps({'script': script}) + '\n').encode('utf-8')
+        with self._worker_lock:
+            if self._worker is None or self._worker.poll() is not None:
+                self._worker = self._spawn_worker(python_path)
+            try:
+                self._worker.stdin.write(request)
+                self._worker.stdin.flush()
+            except BrokenPipeError:
+                # 进程在收到请求前已退出，脚本尚未执行，重启后重发一次
+                self._worker = self._spawn_worker(python_path)
+                self._worker.stdin.write(request)
+                self._worker.stdin.flush()
+            
+            line = self._worker.stdout.readline()
+            if not line:
+                # 脚本执行过程中进程退出，下次调用时重新启动
+                returncode = self._worker.wait()
+                self._worker = None
+                raise subprocess.CalledProcessError(returncode, [str(python_path), '-c', script], stderr='脚本执行进程意外退出')
+        
+        response = _loads(line)
+        if response['returncode'] != 0:
+            raise subprocess.CalledProcessError(
+                response['returncode'],
+                [str(python_path), '-c', script],
+                output=response['stdout'],
+                stderr=response['traceback']
+            )
+        return response['stdout']
+    
     def execute_script(self, script: str) -> Any:
-        """在独立的Python进程中执行脚本
+        """在服务虚拟环境的常驻Python进程中执行脚本
         
         Args:
             script: 要执行的Python脚本内容
@@ -83,24 +146,19 @@ class BaseService(ABC):
             if not env_path.exists():
                 self.logger.error("服务虚拟环境不存在")
                 raise ValueError('服务虚拟环境不存在')
-            self.logger.debug(f"使用Python解释器路径: {env_path}")
+            self.logger.debug("使用Python解释器路径: %s", env_path)
             
             python_path = env_path / 'bin' / 'python' if sys.platform != 'win32' else env_path / 'Scripts' / 'python.exe'
             
-            # 在独立的Python进程中执行脚本
-            result = subprocess.run(
-                [str(python_path), '-c', script],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            # 在常驻的Python进程中执行脚本，避免每次调用都启动解释器
+            stdout = self._run_in_worker(python_path, script)
             
             # 解析输出结果
             try:
-                output = json.loads(result.stdout)
-                self.logger.info(f"服务执行结果: {output}")
+                output = _loads(stdout)
+                self.logger.info("服务执行结果: %s", output)
                 if 'error' in output:
-                    self.logger.error(f"脚本执行发生错误: {output['error']}")
+                    self.logger.error("脚本执行发生错误: %s", output['error'])
                     raise ValueError(output['error'])
                 return output.get('result')
             except json.JSONDecodeError:
@@ -109,12 +167,12 @@ class BaseService(ABC):
                 
         except subprocess.CalledProcessError as e:
             error_output = e.stderr.strip() if e.stderr else "无错误输出"
-            self.logger.error(f"脚本执行失败: {e}\n错误输出: {error_output}")
+            self.logger.error("脚本执行失败: %s\n错误输出: %s", e, error_output)
             import traceback
-            self.logger.error(f"错误堆栈:\n{traceback.format_exc()}")
+            self.logger.error("错误堆栈:\n%s", traceback.format_exc())
             raise Exception(status_code=500, detail=f"脚本执行失败: {e}\n错误输出: {error_output}")
         except Exception as e:
-            self.logger.error(f"服务发生未预期的错误: {e}")
+            self.logger.error("服务发生未预期的错误: %s", e)
             raise Exception(status_code=500, detail=str(e))
     
     @abstractmethod
@@ -138,7 +196,7 @@ class BaseService(ABC):
         Returns:
             服务执行结果
         """
-        self.logger.info(f"接收到服务请求，参数: {params}")
+        self.logger.info("接收到服务请求，参数: %s", params)
         script = self.get_script(params)
-        self.logger.debug(f"服务执行脚本: {script}")
+        self.logger.debug("服务执行脚本: %s", script)
         return self.execute_script(script)
\ No newline at end of file
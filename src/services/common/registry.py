@@ -4,32 +4,28 @@
 """
 
 import os
+import functools
 import json
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
 from src.utils.logger import Logger
+from src.utils.json_utils import loads as json_loads, dumps as json_dumps
+
+# 项目根目录，与环境管理器、进程管理器保持一致，不依赖当前工作目录
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent.parent
 
 class ServiceRegistry:
     """服务注册管理器
     
     提供服务注册接口，生成服务模板文件。
-    使用单例模式确保全局只有一个实例。
+    通过get_registry获取全局共享的实例。
     """
     
-    _instance = None
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
-        return cls._instance
-    
     def __init__(self):
-        if self._initialized:
-            return
         self.logger = Logger(__name__)
-        self.implementations_dir = Path.cwd() / 'src' / 'services' / 'implementations'
-        self._initialized = True
+        self.implementations_dir = _PROJECT_ROOT / 'src' / 'services' / 'implementations'
+        # 已注册仓库缓存: (service.json路径及修改时间的集合, 已注册仓库集合)
+        self._registered_cache: Optional[tuple] = None
     
     def register_service(self, service_name: str, repo_path: Path) -> bool:
         """注册新服务
@@ -85,8 +81,7 @@ class ServiceRegistry:
     def _create_service_json(self, service_dir: Path, service_json: Dict) -> None:
         """创建service.json文件"""
         json_path = service_dir / 'service.json'
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(service_json, f, indent=4, ensure_ascii=False)
+        json_path.write_bytes(json_dumps(service_json))
     
     def _create_service_py(self, service_dir: Path, service_name: str) -> None:
         """创建service.py文件"""
@@ -96,6 +91,42 @@ class ServiceRegistry:
         with open(py_path, 'w', encoding='utf-8') as f:
             f.write(service_template)
     
+    def _get_registered_repos(self) -> Set[str]:
+        """扫描 implementations 目录下所有服务的 service.json，获取已注册的仓库
+        
+        只要各 service.json 的路径和修改时间都未变化，就直接返回上次的扫描结果。
+        """
+        service_jsons = []
+        with os.scandir(self.implementations_dir) as it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                service_json_path = os.path.join(entry.path, 'service.json')
+                try:
+                    service_jsons.append((service_json_path, os.stat(service_json_path).st_mtime_ns))
+                except FileNotFoundError:
+                    continue
+        
+        fingerprint = frozenset(service_jsons)
+        if self._registered_cache and self._registered_cache[0] == fingerprint:
+            return self._registered_cache[1]
+        
+        registered_repos = set()
+        for service_json_path, _ in service_jsons:
+            try:
+                with open(service_json_path, 'rb') as f:
+                    data = f.read()
+                service_json = json_loads(data)
+                repo_path = service_json.get('repo_path', '')
+                if repo_path:
+                    registered_repos.add(repo_path)
+            except json.JSONDecodeError as e:
+                self.logger.warning(f'服务配置文件 {service_json_path} 格式错误: {str(e)}')
+                continue
+        
+        self._registered_cache = (fingerprint, registered_repos)
+        return registered_repos
+    
     def get_service_status(self, service_name: str) -> Dict[str, str]:
         """获取服务注册状态
         
@@ -110,28 +141,11 @@ class ServiceRegistry:
         try:
             self.logger.info(f'开始检查服务 {service_name} 的注册状态')
             
-            # 1. 扫描 implementations 目录下所有服务的 service.json
-            registered_repos = []
-            for service_dir in self.implementations_dir.iterdir():
-                if not service_dir.is_dir():
-                    continue
-                    
-                service_json_path = service_dir / 'service.json'
-                if not service_json_path.exists():
-                    continue
-                    
-                try:
-                    with open(service_json_path, 'r', encoding='utf-8') as f:
-                        service_json = json.load(f)
-                        repo_path = service_json.get('repo_path', '')
-                        if repo_path:
-                            registered_repos.append(repo_path)
-                except json.JSONDecodeError as e:
-                    self.logger.warning(f'服务配置文件 {service_json_path} 格式错误: {str(e)}')
-                    continue
+            # 1. 获取 implementations 目录下所有服务 service.json 中登记的仓库
+            registered_repos = self._get_registered_repos()
             
             # 2. 获取 repo 目录下的所有项目
-            repo_dir = Path.cwd() / 'repo'
+            repo_dir = _PROJECT_ROOT / 'repo'
             if not repo_dir.exists() or not repo_dir.is_dir():
                 self.logger.warning('repo目录不存在或无效')
                 return {
@@ -178,3 +192,9 @@ class ServiceRegistry:
                 'status': 'invalid',
                 'message': f'获取服务状态失败: {str(e)}'
             }
+
+
+@functools.lru_cache(maxsize=None)
+def get_registry() -> ServiceRegistry:
+    """获取全局共享的服务注册管理器实例"""
+    return ServiceRegistry()
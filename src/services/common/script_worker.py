@@ -0,0 +1,61 @@
+"""脚本执行工作进程
+
+在服务虚拟环境的Python解释器中常驻运行，逐行从stdin读取JSON请求并执行其中的脚本，
+将脚本的标准输出和退出状态以单行JSON写回。该模块只依赖标准库。
+
+请求格式: {"script": "<python代码>"}
+响应格式: {"stdout": "<脚本输出>", "returncode": <退出码>, "traceback": "<异常堆栈或null>"}
+
+与每次启动`python -c`不同，进程在多次请求之间常驻：每个脚本使用新的全局命名空间，
+但已导入的模块（sys.modules及其模块级状态）、环境变量、当前目录等进程级状态会保留到后续请求。
+"""
+
+import io
+import os
+import sys
+import json
+import traceback
+from contextlib import redirect_stdout
+
+
+def main():
+    # 与python -c一致，sys.path[0]为当前目录：脚本可以导入工作目录下的模块，
+    # 也不会导入或被本文件所在目录（PyService内部模块）遮蔽
+    sys.path[0] = ''
+
+    # 复制原始stdin作为请求通道，并把fd 0和sys.stdin指向空设备，防止脚本读取stdin时读走请求
+    incoming = os.fdopen(os.dup(0), 'r', encoding='utf-8')
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.stdin = open(os.devnull, 'r', encoding='utf-8')
+
+    # 复制原始stdout作为协议通道，并把fd 1指向stderr，
+    # 防止子进程或C扩展直接写fd 1破坏协议输出
+    protocol = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+    os.dup2(2, 1)
+
+    for line in incoming:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        buffer = io.StringIO()
+        returncode = 0
+        error = None
+        try:
+            with redirect_stdout(buffer):
+                exec(compile(request['script'], '<script>', 'exec'), {'__name__': '__main__'})
+        except SystemExit as e:
+            if e.code not in (None, 0):
+                returncode = e.code if isinstance(e.code, int) else 1
+                error = str(e.code)
+        except BaseException:
+            returncode = 1
+            error = traceback.format_exc()
+
+        protocol.write(json.dumps({'stdout': buffer.getvalue(), 'returncode': returncode, 'traceback': error}) + '\n')
+        protocol.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,26 +3,54 @@
 提供服务管理和执行的Web界面。
 """
 
+import os
+import re
+import json
+import subprocess
+import threading
 import streamlit as st
+from collections import deque
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Any
-from src.services.common.registry import ServiceRegistry
-from src.core.process import ServiceProcessManager
-from src.core.environment import EnvironmentManager
-from src.core.discovery import ServiceDiscovery
+from typing import Dict, Any, Optional, Tuple
+from src.services.common.registry import get_registry
+from src.core.process import get_process_manager
+from src.core.environment import get_environment_manager
+from src.core.discovery import get_discovery
+
+# 响应数组超过该长度时以表格渲染
+_TABLE_MIN_ITEMS = 5
+# 响应数组超过该长度时不再逐项渲染，改用st.json
+_ITEMS_MAX_WIDGETS = 10
+# 运行中服务的环境状态，服务能够运行说明环境已就绪
+_RUNNING_ENV_STATUS = {'venv_exists': True, 'dependencies_installed': True, 'is_ready': True, 'config_type': None}
+# git clone --progress输出中的进度百分比
+_PROGRESS_RE = re.compile(r'(\d+)%')
 
 def init_session_state():
     """初始化会话状态"""
     if 'registry' not in st.session_state:
-        st.session_state.registry = ServiceRegistry()
+        st.session_state.registry = get_registry()
     if 'env_manager' not in st.session_state:
-        st.session_state.env_manager = EnvironmentManager(Path.cwd())
+        st.session_state.env_manager = get_environment_manager()
     if 'runtime' not in st.session_state:
-        st.session_state.runtime = ServiceProcessManager()
+        st.session_state.runtime = get_process_manager()
     if 'discovery' not in st.session_state:
-        st.session_state.discovery = ServiceDiscovery(Path.cwd() / 'repo')
+        st.session_state.discovery = get_discovery()
     if 'services_cache' not in st.session_state:
         st.session_state.services_cache = None
+    if 'services_cache_fp' not in st.session_state:
+        st.session_state.services_cache_fp = None
+    if 'repo_path' not in st.session_state:
+        # 与注册表、进程管理器使用同一个项目根目录
+        st.session_state.repo_path = st.session_state.env_manager.base_path / 'repo'
+        st.session_state.repo_path.mkdir(parents=True, exist_ok=True)
+        st.session_state.repos_cache = None
+        st.session_state.repos_mtime = 0
+    if 'clone_procs' not in st.session_state:
+        st.session_state.clone_procs = {}
+        # 已结束的克隆任务: (项目名称, 是否成功, 最后一行输出)，显示一次后清除
+        st.session_state.clone_results = []
     if 'running_services_cache' not in st.session_state:
         st.session_state.running_services_cache = {}
     if 'playground_cache' not in st.session_state:
@@ -34,26 +62,39 @@ def init_session_state():
 def render_service_list():
     """渲染服务列表"""
     st.header('服务列表')
+    env_manager = st.session_state.env_manager
+    runtime = st.session_state.runtime
+    discovery = st.session_state.discovery
+    running_cache = st.session_state.running_services_cache
     
-    # 使用缓存的服务列表，只在必要时重新扫描
-    if st.session_state.services_cache is None:
-        st.session_state.services_cache = st.session_state.discovery.scan_services()
+    # 使用缓存的服务列表，服务目录指纹变化时才重新扫描
+    fp = discovery.fingerprint()
+    if st.session_state.services_cache is None or fp != st.session_state.services_cache_fp:
+        st.session_state.services_cache = discovery.scan_services()
+        st.session_state.services_cache_fp = fp
     services = st.session_state.services_cache
     
     if not services:
         st.info('当前没有可用的服务')
         return
     
+    # 在渲染前一次性获取所有服务的运行状态和环境状态，运行中的服务环境必然就绪，不再检查
+    statuses = runtime.get_all_service_statuses()
+    envs = env_manager.check_environments_bulk([
+        s['name'] for s in services
+        if not (statuses.get(s['name']) or {}).get('running')
+    ])
+    
     for service_info in services:
         service_name = service_info['name']
         col1, col2 = st.columns([3, 2])
         with col1:
             st.subheader(service_name)
             # 检查环境状态
-            env_status = st.session_state.env_manager.check_environment(service_name)
+            env_status = envs.get(service_name, _RUNNING_ENV_STATUS)
             # 获取服务运行状态
-            service_status = st.session_state.runtime.get_service_status(service_name)
-            st.session_state.running_services_cache[service_name] = service_status
+            service_status = statuses.get(service_name)
+            running_cache[service_name] = service_status
             
             # 根据环境状态和运行状态设置显示状态
             if not env_status['is_ready']:
@@ -74,60 +115,52 @@ def render_service_list():
         with col2:
             # 根据环境状态和运行状态显示不同的操作按钮
             if env_status['is_ready']:
-                # 从缓存中获取服务状态
-                service_status = st.session_state.runtime.get_service_status(service_name)
-                st.session_state.running_services_cache[service_name] = service_status
-                
                 if service_status and service_status.get('running'):
                     if st.button('停止', key=f'stop_{service_name}'):
-                        if st.session_state.runtime.stop_service(service_name):
+                        if runtime.stop_service(service_name):
                             # 更新缓存
-                            st.session_state.running_services_cache[service_name] = {
+                            running_cache[service_name] = {
                                 'pid': None,
                                 'returncode': None,
                                 'running': False
                             }
-                            # 更新running_services_list缓存
+                            # 更新running_services_list和running_services_map缓存
                             if 'running_services_list' in st.session_state:
                                 st.session_state.running_services_list = [
                                     s for s in st.session_state.running_services_list
                                     if s[0] != service_name
                                 ]
+                                st.session_state.running_services_map.pop(service_name, None)
                             st.success('服务已停止')
                             st.rerun()
                         else:
                             st.error('停止服务失败')
                 else:
                     if st.button('启动', key=f'start_{service_name}'):
-                        if st.session_state.runtime.start_service(service_name, {}):
-                            # 更新缓存状态为运行中
-                            st.session_state.running_services_cache[service_name] = {
-                                'running': True,
-                                'port': None,
-                                'status': {'is_ready': True, 'error': None}
-                            }
-                            # 更新running_services_list缓存
+                        result = runtime.start_service_sync(service_name, {})
+                        if result['success']:
+                            # 只在启动后重新获取一次服务状态，更新缓存
+                            running_cache[service_name] = runtime.get_service_status(service_name)
+                            # 更新running_services_list和running_services_map缓存
+                            # service_info来自本次渲染的服务列表，无需再次查询
                             if 'running_services_list' in st.session_state:
-                                service_info = st.session_state.discovery.get_service_info(service_name)
-                                if service_info:
-                                    st.session_state.running_services_list.append((service_name, service_info))
+                                st.session_state.running_services_list.append((service_name, service_info))
+                                st.session_state.running_services_map[service_name] = service_info
                             st.success('服务启动成功')
                             st.rerun()
                         else:
-                            st.error('服务启动失败')
+                            st.error(f"服务启动失败: {result['error']}")
             else:
                 if st.button('配置环境', key=f'setup_{service_name}'):
                     # 创建环境
-                    env_path = st.session_state.env_manager.create_environment(service_name)
+                    env_path = env_manager.create_environment(service_name)
                     if not env_path:
                         st.error('环境创建失败')
                         return
                     
                     # 安装依赖
-                    if st.session_state.env_manager.install_dependencies(service_name):
+                    if env_manager.install_dependencies(service_name):
                         st.success('环境配置成功')
-                        # 清除缓存，强制重新扫描服务
-                        st.session_state.services_cache = None
                         st.rerun()
                     else:
                         st.error('依赖安装失败')
@@ -138,6 +171,7 @@ def render_service_execution():
         return
     
     st.header('服务执行')
+    runtime = st.session_state.runtime
     service_name = st.session_state.selected_service
     
     # 检查服务是否存在
@@ -153,9 +187,9 @@ def render_service_execution():
     
     if st.button('执行服务'):
         try:
-            result = st.session_state.runtime.execute_service(service_name, params)
+            result = runtime.execute_service_sync(service_name, params)
             # 更新服务状态缓存
-            service_status = st.session_state.runtime.get_service_status(service_name)
+            service_status = runtime.get_service_status(service_name)
             if service_status:
                 st.session_state.running_services_cache[service_name] = service_status
             st.success('服务执行成功')
@@ -166,6 +200,8 @@ def render_service_execution():
 def render_playground():
     """渲染Playground界面"""
     st.header('服务Playground')
+    runtime = st.session_state.runtime
+    playground_cache = st.session_state.playground_cache
     
     # 获取所有运行中的服务
     running_services = []
@@ -173,12 +209,14 @@ def render_playground():
     if 'running_services_list' not in st.session_state:
         st.session_state.running_services_list = []
         services = st.session_state.services_cache or st.session_state.discovery.scan_services()
+        statuses = runtime.get_all_service_statuses()
         for service_info in services:
             service_name = service_info['name']
-            service_status = st.session_state.runtime.get_service_status(service_name)
+            service_status = statuses.get(service_name)
             if service_status and service_status.get('running'):
                 running_services.append((service_name, service_info))
         st.session_state.running_services_list = running_services
+        st.session_state.running_services_map = dict(running_services)
     else:
         running_services = st.session_state.running_services_list
     
@@ -194,132 +232,211 @@ def render_playground():
     # 服务选择
     selected_service = st.selectbox(
         '选择服务',
-        options=[s[0] for s in running_services],
+        options=tuple(st.session_state.running_services_map),
         format_func=lambda x: x,
         key='playground_service_select'
     )
     
     # 更新选中的服务
-    if selected_service != st.session_state.playground_cache['selected_service']:
-        st.session_state.playground_cache['selected_service'] = selected_service
-        st.session_state.playground_cache['input_params'] = {}
+    if selected_service != playground_cache['selected_service']:
+        playground_cache['selected_service'] = selected_service
+        playground_cache['input_params'] = {}
     
-    # 获取选中服务的信息
-    service_info = next(s[1] for s in running_services if s[0] == selected_service)
-    
-    # 显示API路由信息
-    if 'api_routes' in service_info:
-        route = service_info['api_routes'][0]  # 目前假设每个服务只有一个API路由
-        st.subheader(f'API: {route["path"]} ({route["method"]})')
+    # 显示API路由信息，与execute_service实际调用的路由一致
+    route = runtime.get_execute_route(selected_service)
+    if route:
+        st.subheader(f'API: {route["path"]} ({route.get("method", "POST")})')
         
-        # 根据请求schema生成输入表单
+        # 根据请求schema生成输入表单，表单内的输入在提交时才触发重新运行
         st.markdown('### 请求参数')
-        input_params = render_input_form(route.get('request_schema', {}), prefix='playground')
+        with st.form(key=f'playground_form_{selected_service}'):
+            input_params = render_input_form(route.get('request_schema', {}), prefix='playground')
+            submitted = st.form_submit_button('执行')
         
         # 更新输入参数缓存
-        st.session_state.playground_cache['input_params'] = input_params
+        playground_cache['input_params'] = input_params
         
         # 执行按钮和结果显示
-        if st.button('执行', key='execute_service'):
+        if submitted:
             try:
-                result = st.session_state.runtime.execute_service(selected_service, input_params)
+                result = runtime.execute_service_sync(selected_service, input_params)
                 st.success('执行成功')
                 st.markdown('### 响应结果')
                 render_response_data(route.get('response_schema', {}), result)
             except Exception as e:
                 st.error(f'执行失败: {str(e)}')
 
-def render_input_form(schema: dict, prefix: str = '') -> dict:
-    """根据schema渲染输入表单
+@dataclass(frozen=True)
+class CompiledField:
+    """预编译的表单字段
     
-    Args:
-        schema: 请求参数的JSON Schema
-        prefix: 输入字段的前缀，用于区分不同表单的输入
-        
-    Returns:
-        dict: 表单输入的参数
+    由_compile_schema从JSON Schema生成，渲染时直接使用，不再遍历schema。
     """
-    params = {}
     
-    if not schema or not isinstance(schema, dict):
-        return params
+    name: str  # 参数名称
+    kind: str  # 控件类型，对应_WIDGETS中的键
+    title: str
+    help: str
+    key: str  # Streamlit控件key
+    default: Any = None  # 控件初始值，单选枚举为选项下标
+    enum: Optional[list] = None
+    min: Optional[float] = None  # 数值最小值或数组最小长度
+    max: Optional[float] = None  # 数值最大值或数组最大长度
+    children: Tuple['CompiledField', ...] = ()  # 嵌套对象的字段
+
+def _unpack(field_name: str, field_info: dict) -> tuple:
+    """一次取出字段定义中的常用属性
     
-    properties = schema.get('properties', {})
-    for field_name, field_info in properties.items():
-        field_type = field_info.get('type', 'string')
-        field_title = field_info.get('title', field_name)
-        field_description = field_info.get('description', '')
+    Returns:
+        tuple: (类型, 标题, 描述, 默认值, 枚举值, 最小值, 最大值)
+    """
+    get = field_info.get
+    return (
+        get('type', 'string'), get('title', field_name), get('description', ''),
+        get('default'), get('enum'), get('minimum'), get('maximum')
+    )
+
+def _compile_fields(schema: dict, prefix: str) -> Tuple[CompiledField, ...]:
+    """遍历schema的properties，生成预编译的字段列表"""
+    fields = []
+    for field_name, field_info in schema.get('properties', {}).items():
+        field_type, field_title, field_description, field_default, field_enum, field_min, field_max = _unpack(field_name, field_info)
         field_key = f'{prefix}_{field_name}' if prefix else field_name
-        field_default = field_info.get('default')
         
         if field_type == 'string':
-            if 'enum' in field_info:
+            if field_enum is not None:
                 # 对于枚举类型，使用selectbox
-                params[field_name] = st.selectbox(
-                    field_title,
-                    options=field_info['enum'],
-                    help=field_description,
-                    key=field_key,
-                    index=field_info['enum'].index(field_default) if field_default in field_info.get('enum', []) else 0
-                )
+                index = field_enum.index(field_default) if field_default in field_enum else 0
+                fields.append(CompiledField(field_name, 'enum', field_title, field_description, field_key, index, field_enum))
             else:
-                params[field_name] = st.text_input(
-                    field_title,
-                    value=field_default or '',
-                    help=field_description,
-                    key=field_key
-                )
+                fields.append(CompiledField(field_name, 'string', field_title, field_description, field_key, field_default or ''))
         elif field_type == 'number':
-            min_value = field_info.get('minimum', None)
-            max_value = field_info.get('maximum', None)
-            params[field_name] = st.number_input(
-                field_title,
-                min_value=min_value,
-                max_value=max_value,
-                value=float(field_default or 0),
-                help=field_description,
-                key=field_key
-            )
+            fields.append(CompiledField(
+                field_name, 'number', field_title, field_description, field_key, float(field_default or 0),
+                min=field_min, max=field_max
+            ))
         elif field_type == 'boolean':
-            params[field_name] = st.checkbox(
-                field_title,
-                value=field_default or False,
-                help=field_description,
-                key=field_key
-            )
+            fields.append(CompiledField(field_name, 'boolean', field_title, field_description, field_key, field_default or False))
         elif field_type == 'array':
             min_items = field_info.get('minItems')
             max_items = field_info.get('maxItems')
             help_text = field_description
             if min_items is not None or max_items is not None:
                 help_text += f" (数组长度限制: {min_items or '无'} - {max_items or '无'})"
-            
-            value = st.text_input(
-                field_title,
-                help=f'{help_text} (用逗号分隔多个值)',
-                key=field_key,
-                value=','.join(map(str, field_default)) if field_default else ''
-            )
-            items = [item.strip() for item in value.split(',')] if value else []
-            
-            # 验证数组长度
-            if min_items is not None and len(items) < min_items:
-                st.warning(f"{field_title}至少需要{min_items}个元素")
-            if max_items is not None and len(items) > max_items:
-                st.warning(f"{field_title}最多允许{max_items}个元素")
-                items = items[:max_items]
-            
-            params[field_name] = items
+            item_enum = field_info.get('items', {}).get('enum')
+            if item_enum:
+                # 元素为枚举值时使用多选框，无需解析字符串
+                # 默认值超过max_selections时multiselect会报错，按maxItems截断
+                default_items = [item for item in field_default or [] if item in item_enum]
+                if max_items is not None:
+                    default_items = default_items[:max_items]
+                fields.append(CompiledField(
+                    field_name, 'multiselect', field_title, help_text, field_key,
+                    default_items, item_enum, min=min_items, max=max_items
+                ))
+            else:
+                # 每行一个元素，元素内容可以包含逗号
+                fields.append(CompiledField(
+                    field_name, 'array', field_title, f'{help_text} (每行一个值)', field_key,
+                    '\n'.join(map(str, field_default)) if field_default else '', min=min_items, max=max_items
+                ))
         elif field_type == 'object':
-            # 递归处理嵌套对象
-            st.markdown(f"**{field_title}**")
-            if field_description:
-                st.markdown(f"*{field_description}*")
-            with st.expander(field_title, expanded=True):
-                nested_params = render_input_form(field_info, f"{field_key}_")
-                params[field_name] = nested_params
+            # 嵌套对象在编译时展开，渲染时不再递归遍历schema
+            fields.append(CompiledField(
+                field_name, 'object', field_title, field_description, field_key,
+                children=_compile_fields(field_info, f'{field_key}_')
+            ))
+    return tuple(fields)
+
+@st.cache_resource(max_entries=32)
+def _compile_schema(schema_json: str, prefix: str) -> Tuple[CompiledField, ...]:
+    """编译请求schema，结果按schema内容和前缀缓存
+    
+    Args:
+        schema_json: 序列化后的JSON Schema，保留properties顺序以保持表单字段顺序
+        prefix: 输入字段的前缀
+    """
+    return _compile_fields(json.loads(schema_json), prefix)
+
+def _check_items(cf: CompiledField, items: list) -> list:
+    """验证数组长度，超出最大长度时截断"""
+    if cf.min is not None and len(items) < cf.min:
+        st.warning(f"{cf.title}至少需要{cf.min}个元素")
+    if cf.max is not None and len(items) > cf.max:
+        st.warning(f"{cf.title}最多允许{cf.max}个元素")
+        items = items[:cf.max]
+    return items
+
+def _array_widget(cf: CompiledField) -> list:
+    """渲染数组输入框，每行一个元素
     
-    return params
+    解析结果按输入内容缓存在session_state中，输入未变化时不重复解析。
+    """
+    value = st.text_area(cf.title, help=cf.help, key=cf.key, value=cf.default)
+    parsed_key = f'{cf.key}_parsed'
+    parsed = st.session_state.get(parsed_key)
+    if parsed is None or parsed[0] != value:
+        parsed = (value, [line.strip() for line in value.splitlines() if line.strip()])
+        st.session_state[parsed_key] = parsed
+    return _check_items(cf, parsed[1])
+
+def _multiselect_widget(cf: CompiledField) -> list:
+    """渲染枚举数组的多选框"""
+    items = st.multiselect(
+        cf.title, options=cf.enum, default=cf.default, help=cf.help, key=cf.key, max_selections=cf.max
+    )
+    return _check_items(cf, items)
+
+def _object_widget(cf: CompiledField) -> dict:
+    """渲染嵌套对象的字段"""
+    st.markdown(f"**{cf.title}**")
+    if cf.help:
+        st.markdown(f"*{cf.help}*")
+    with st.expander(cf.title, expanded=True):
+        return _render_fields(cf.children)
+
+# 控件类型 -> 渲染函数
+_WIDGETS = {
+    'string': lambda cf: st.text_input(cf.title, value=cf.default, help=cf.help, key=cf.key),
+    'enum': lambda cf: st.selectbox(cf.title, options=cf.enum, help=cf.help, key=cf.key, index=cf.default),
+    'number': lambda cf: st.number_input(
+        cf.title, min_value=cf.min, max_value=cf.max, value=cf.default, help=cf.help, key=cf.key
+    ),
+    'boolean': lambda cf: st.checkbox(cf.title, value=cf.default, help=cf.help, key=cf.key),
+    'array': _array_widget,
+    'multiselect': _multiselect_widget,
+    'object': _object_widget,
+}
+
+def _render_fields(fields: Tuple[CompiledField, ...]) -> dict:
+    """按预编译的字段列表渲染控件并收集输入值"""
+    return {cf.name: _WIDGETS[cf.kind](cf) for cf in fields}
+
+def render_input_form(schema: dict, prefix: str = '') -> dict:
+    """根据schema渲染输入表单
+    
+    schema先编译为扁平的字段列表并缓存，每次重新运行只按列表渲染控件。
+    
+    Args:
+        schema: 请求参数的JSON Schema
+        prefix: 输入字段的前缀，用于区分不同表单的输入
+        
+    Returns:
+        dict: 表单输入的参数
+    """
+    if not schema or not isinstance(schema, dict):
+        return {}
+    
+    return _render_fields(_compile_schema(json.dumps(schema), prefix))
+
+def _is_flat_rows(items: list) -> bool:
+    """判断数组能否直接渲染为表格：元素全为标量，或全为只包含标量值的对象"""
+    if all(not isinstance(item, (dict, list)) for item in items):
+        return True
+    return all(
+        isinstance(item, dict) and not any(isinstance(value, (dict, list)) for value in item.values())
+        for item in items
+    )
 
 def render_response_data(schema: dict, data: Any) -> None:
     """根据schema渲染响应数据
@@ -343,9 +460,7 @@ def render_response_data(schema: dict, data: Any) -> None:
         return
     
     for field_name, field_info in properties.items():
-        field_type = field_info.get('type', 'string')
-        field_title = field_info.get('title', field_name)
-        field_description = field_info.get('description', '')
+        field_type, field_title, field_description, *_ = _unpack(field_name, field_info)
         
         # 获取字段值
         field_value = data.get(field_name)
@@ -355,6 +470,17 @@ def render_response_data(schema: dict, data: Any) -> None:
             with st.expander(field_title, expanded=True):
                 render_response_data(field_info, field_value)
         elif field_type == 'array' and isinstance(field_value, list):
+            if len(field_value) > _TABLE_MIN_ITEMS and _is_flat_rows(field_value):
+                # 扁平数组合并为一个表格渲染，只有嵌套对象才逐项渲染
+                st.markdown(f"**{field_title}**")
+                rows = field_value if isinstance(field_value[0], dict) else {field_title: field_value}
+                st.dataframe(rows, use_container_width=True)
+                continue
+            if len(field_value) > _ITEMS_MAX_WIDGETS or not all(isinstance(item, dict) for item in field_value):
+                # 较长或元素不是对象的数组作为一个JSON树渲染
+                st.markdown(f"**{field_title}**")
+                st.json(field_value)
+                continue
             for i, item in enumerate(field_value):
                 st.markdown(f"**项目 {i+1}**")
                 if 'items' in field_info and isinstance(item, dict):
@@ -388,6 +514,55 @@ def render_response_data(schema: dict, data: Any) -> None:
                 help=field_description
             )
 
+def _drain_output(proc: subprocess.Popen, output: deque) -> None:
+    """持续读取子进程输出，避免管道写满阻塞子进程
+    
+    文本模式下git进度输出中的\r也会被当作换行，每次进度刷新都是单独的一行。
+    """
+    for line in proc.stdout:
+        line = line.strip()
+        if line:
+            output.append(line)
+    proc.stdout.close()
+
+def _render_clone_jobs() -> None:
+    """显示后台克隆任务的进度
+    
+    进度区域是一个定时刷新的fragment，未完成期间只重新运行该区域，不重新运行整个页面；
+    有任务结束时才重新运行整个页面，刷新项目列表并显示克隆结果。
+    """
+    clone_results = st.session_state.clone_results
+    for project_name, success, message in clone_results:
+        if success:
+            st.success(f'项目 {project_name} 克隆成功')
+        else:
+            st.error(f'项目 {project_name} 克隆失败：{message}')
+    clone_results.clear()
+    
+    clone_procs = st.session_state.clone_procs
+    if not clone_procs:
+        return
+    
+    @st.fragment(run_every=0.5)
+    def clone_progress():
+        st.subheader('克隆进度')
+        finished = False
+        for project_name, job in list(clone_procs.items()):
+            returncode = job['proc'].poll()
+            last_line = job['output'][-1] if job['output'] else ''
+            if returncode is None:
+                match = _PROGRESS_RE.search(last_line)
+                st.progress(int(match.group(1)) if match else 0, text=f'{project_name}: {last_line or "正在克隆..."}')
+            else:
+                clone_results.append((project_name, returncode == 0, last_line))
+                del clone_procs[project_name]
+                finished = True
+        
+        if finished:
+            st.rerun()
+    
+    clone_progress()
+
 def main():
     """主函数"""
     st.set_page_config(
@@ -404,12 +579,18 @@ def main():
         st.header('服务注册')
         
         # 显示所有repo目录下的项目
-        repo_path = Path.cwd() / 'repo'
-        if not repo_path.exists():
-            repo_path.mkdir(parents=True)
+        repo_path = st.session_state.repo_path
         
-        # 获取所有repo目录下的项目
-        repos = [d for d in repo_path.iterdir() if d.is_dir()]
+        # 获取所有repo目录下的项目，repo目录有增删时才重新遍历
+        # repo目录可能在会话期间被删除，读取修改时间前重新创建
+        repo_path.mkdir(parents=True, exist_ok=True)
+        mtime = repo_path.stat().st_mtime_ns
+        if st.session_state.repos_cache is None or mtime != st.session_state.repos_mtime:
+            with os.scandir(repo_path) as it:
+                st.session_state.repos_cache = [Path(entry.path) for entry in it if entry.is_dir()]
+            st.session_state.repos_mtime = mtime
+        # 正在克隆的项目由_render_clone_jobs显示，克隆完成前不能注册
+        repos = [repo for repo in st.session_state.repos_cache if repo.name not in st.session_state.clone_procs]
         
         # 显示现有项目列表
         st.subheader('现有项目')
@@ -433,12 +614,13 @@ def main():
                         if st.button('注册', key=f'register_{repo.name}'):
                             if st.session_state.registry.register_service(repo.name, repo.absolute()):
                                 st.success('服务注册成功')
-                                # 清除服务缓存，强制重新扫描
-                                st.session_state.services_cache = None
                                 st.rerun()
                             else:
                                 st.error('服务注册失败')
                 
+        # 显示正在克隆的项目
+        _render_clone_jobs()
+        
         # 添加新项目
         st.subheader('添加新项目')
         with st.form('add_repo_form'):
@@ -457,25 +639,21 @@ def main():
                     
                     # 检查项目名称是否已存在
                     target_path = repo_path / project_name
-                    if target_path.exists():
+                    if target_path.exists() or project_name in st.session_state.clone_procs:
                         st.error(f'项目 {project_name} 已存在')
                         return
                     
-                    # 克隆仓库
-                    import subprocess
-                    result = subprocess.run(
-                        ['git', 'clone', github_url, str(target_path)],
-                        capture_output=True,
+                    # 在后台克隆仓库，页面在后续刷新中显示进度
+                    proc = subprocess.Popen(
+                        ['git', 'clone', '--progress', github_url, str(target_path)],
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,
                         text=True
                     )
-                    
-                    if result.returncode == 0:
-                        st.success('项目克隆成功')
-                        # 清除服务缓存，强制重新扫描
-                        st.session_state.services_cache = None
-                        st.rerun()
-                    else:
-                        st.error(f'克隆失败：{result.stderr}')
+                    output = deque(maxlen=50)
+                    threading.Thread(target=_drain_output, args=(proc, output), daemon=True).start()
+                    st.session_state.clone_procs[project_name] = {'proc': proc, 'output': output}
+                    st.rerun()
                 except Exception as e:
                     st.error(f'克隆过程中发生错误：{str(e)}')
     
@@ -0,0 +1,26 @@
+"""JSON工具模块
+
+提供统一的JSON解析和序列化函数，安装了orjson时使用orjson，否则回退到标准库json。
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson为可选依赖，未安装时回退到标准库json
+    orjson = None
+
+
+def loads(data) -> Any:
+    """解析JSON字节串或字符串"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """序列化为缩进2个空格的UTF-8 JSON字节串，与是否安装orjson无关"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
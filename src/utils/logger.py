@@ -6,6 +6,7 @@
 import os
 import sys
 import logging
+import logging.handlers
 from pathlib import Path
 from typing import Optional
 
@@ -17,7 +18,12 @@ class Logger:
     
     def __init__(self, name: str, log_file: Optional[str] = None, level: int = logging.DEBUG):
         self.logger = logging.getLogger(name)
+        # 同名logger只配置一次，模块重新加载时不会重复添加处理器
+        if self.logger.handlers:
+            return
         self.logger.setLevel(level)
+        # 已有自己的处理器，不再向root logger传递，避免重复输出
+        self.logger.propagate = False
         
         # 创建格式化器
         formatter = logging.Formatter(
@@ -29,35 +35,37 @@ class Logger:
         console_handler.setFormatter(formatter)
         self.logger.addHandler(console_handler)
         
-        # 如果指定了日志文件，添加文件处理器
+        # 如果指定了日志文件，添加文件处理器，按大小轮转以限制磁盘占用
         if log_file:
             log_dir = Path(log_file).parent
             if not log_dir.exists():
                 log_dir.mkdir(parents=True)
             
-            file_handler = logging.FileHandler(log_file)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=10_000_000, backupCount=3, encoding='utf-8'
+            )
             file_handler.setFormatter(formatter)
             self.logger.addHandler(file_handler)
     
-    def debug(self, message: str):
-        """记录调试级别日志"""
-        self.logger.debug(message)
+    def debug(self, message: str, *args):
+        """记录调试级别日志，args非空时在日志级别启用后才格式化message"""
+        self.logger.debug(message, *args)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """记录信息级别日志"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """记录警告级别日志"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """记录错误级别日志"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """记录严重错误级别日志"""
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
 
 # 创建默认的logger实例
 logger = Logger('pyservice')
\ No newline at end of file